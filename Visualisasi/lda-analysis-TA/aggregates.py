@@ -0,0 +1,148 @@
+import argparse
+import os
+
+import pandas as pd
+
+import store
+
+# Review counts per (app, topic_id, label); every share table is derived from it
+COUNTS = "output/sentiment_counts.csv"
+KEYS = ["app", "topic_id", "label"]
+
+
+def count_reviews(df):
+    # Reviews without a topic (topic_id -1 from pipeline.inference) have no share to count in
+    df = df[df["topic_id"].astype(int) >= 0]
+    return df.groupby(KEYS, observed=True).size().rename("n")
+
+
+def count_by_day(df):
+    # Review counts per (day of `at`, app, topic_id, label); coarser periods are sums of these
+    day = df["at"].dt.floor("D").rename("at")
+    return df.groupby([day] + [df[k] for k in KEYS], observed=True).size().rename("n")
+
+
+def load_counts(path=COUNTS):
+    path = store.resolve(path)
+    if not os.path.exists(path):
+        return pd.Series(dtype="int64", name="n", index=pd.MultiIndex.from_tuples([], names=KEYS))
+    counts = pd.read_csv(path, dtype={"app": str, "topic_id": int, "label": str})
+    return counts.set_index(KEYS)["n"]
+
+
+def save_counts(counts, path=COUNTS):
+    counts.sort_index().reset_index().to_csv(store.resolve(path), index=False)
+
+
+def append(counts, batch):
+    # Only the batch is scanned; the history is already folded into `counts`
+    delta = count_reviews(batch[KEYS].astype({"topic_id": int}))
+    counts = counts.add(delta, fill_value=0).astype("int64")
+    touched = delta.index.droplevel("label").unique()
+    return counts, touched
+
+
+def shares(counts, groups=None):
+    # One row per (app, topic_id) with counts and percentages per sentiment
+    table = counts.unstack("label", fill_value=0).reindex(columns=store.SENTIMENTS, fill_value=0)
+    if groups is not None:
+        table = table.loc[table.index.intersection(groups)]
+    table["sum"] = table[store.SENTIMENTS].sum(axis=1)
+    for sentiment in store.SENTIMENTS:
+        table["%" + sentiment] = table[sentiment] / table["sum"] * 100
+    return table
+
+
+def update_shares(path, rows):
+    # Replace the rows of the touched groups in a long-format share table
+    path = store.resolve(path)
+    if os.path.exists(path):
+        old = pd.read_csv(path, index_col=False)
+        old = old.loc[:, ~old.columns.str.startswith("Unnamed")]
+        keys = pd.MultiIndex.from_frame(rows[["aplikasi", "topic"]].astype(str)).unique()
+        stale = pd.MultiIndex.from_frame(old[["aplikasi", "topic"]].astype(str)).isin(keys)
+        rows = pd.concat([old[~stale], rows], ignore_index=True)
+    return rows
+
+
+def write_count(counts, groups=None, path="output/count.csv"):
+    # Long format read by the LDA output page, rounded to whole percent
+    table = shares(counts, groups)
+    rows = table[["%" + s for s in store.SENTIMENTS]].round().astype(int)
+    rows.columns = store.SENTIMENTS
+    rows = rows.stack().rename("value").reset_index()
+    rows.columns = ["aplikasi", "topic", "sentiment", "value"]
+    rows = update_shares(path, rows)
+    rows.sort_values(["aplikasi", "topic", "sentiment"]).reset_index(drop=True).to_csv(store.resolve(path))
+
+
+def write_chart(counts, topic_names, groups=None, path="dataset/dating(chart).csv"):
+    # Long format of the radar charts; topics without a name are left out
+    table = shares(counts, groups)
+    table = table[table.index.get_level_values("topic_id").isin(list(topic_names))]
+    rows = table[["%" + s for s in store.SENTIMENTS]].round(1)
+    rows.columns = store.SENTIMENTS
+    rows = rows.stack().rename("value").reset_index()
+    rows["topic_id"] = rows["topic_id"].map(topic_names)
+    rows.columns = ["aplikasi", "topic", "sentiment", "value"]
+    rows = update_shares(path, rows)
+    # Same order as a rebuild: load_chart takes the axis order from the file
+    rank = {"topic": {name: i for i, name in topic_names.items()},
+        "sentiment": {s: i for i, s in enumerate(store.SENTIMENTS)}}
+    rows = rows.sort_values(["aplikasi", "topic", "sentiment"], kind="stable",
+        key=lambda column: column.map(rank[column.name]) if column.name in rank else column)
+    rows.to_csv(store.resolve(path), index=False)
+
+
+def write_app_count(counts, app, path):
+    # Wide per-app format of tinder-count.csv / bumble-count.csv
+    table = shares(counts.xs(app, level="app", drop_level=False))
+    table = table.reset_index()
+    out = pd.DataFrame({
+        "aplikasi": table["app"],
+        "topic": "topic_" + table["topic_id"].astype(str),
+        "negative": table["negative"],
+        "positive": table["positive"],
+        "neutral": table["neutral"],
+        "sum": table["sum"],
+        "%(n)": table["%negative"].round(),
+        "%(p)": table["%positive"].round(),
+        "%(neu)": table["%neutral"].round(),
+    })
+    out.to_csv(store.resolve(path), index=False)
+
+
+def parse_topic_names(text):
+    # "0=aplikasi,3=orang" -> {0: "aplikasi", 3: "orang"}
+    return {int(k): v for k, v in (pair.split("=") for pair in text.split(",") if pair)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the per-app/per-topic sentiment tables")
+    parser.add_argument("mode", choices=["rebuild", "append"])
+    parser.add_argument("reviews", help="CSV with app, topic_id and label columns")
+    parser.add_argument("--counts", default=COUNTS)
+    parser.add_argument("--count-table", default="output/count.csv")
+    parser.add_argument("--chart", help="(chart).csv to update")
+    parser.add_argument("--topic-names", default="", help="topic names of the chart, e.g. 0=aplikasi,3=orang")
+    parser.add_argument("--app-counts", nargs="*", default=[], help="APP=PATH pairs, e.g. tinder=../tinder-count.csv")
+    args = parser.parse_args()
+
+    # Appending to missing counts would compute the shares from the batch alone
+    if args.mode == "append" and not os.path.exists(store.resolve(args.counts)):
+        parser.error(args.counts + " does not exist; run rebuild over the full reviews first")
+
+    batch = pd.read_csv(store.resolve(args.reviews), usecols=KEYS)
+    if args.mode == "rebuild":
+        counts, groups = count_reviews(batch.astype({"topic_id": int})), None
+    else:
+        counts, groups = append(load_counts(args.counts), batch)
+    save_counts(counts, args.counts)
+
+    write_count(counts, groups, args.count_table)
+    if args.chart:
+        write_chart(counts, parse_topic_names(args.topic_names), groups, args.chart)
+    for pair in args.app_counts:
+        app, path = pair.split("=", 1)
+        write_app_count(counts, app, path)
+    print(len(batch), "reviews,", len(counts), "groups")
@@ -1,10 +1,30 @@
+from flask import abort, redirect
 import dash
 from dash import Dash, html, dcc
 import dash_bootstrap_components as dbc 
+import plotly.io as pio
 
-app = Dash(__name__, use_pages=True,external_stylesheets=[dbc.themes.PULSE])
+import ldavis
+import payload
+import store
+
+# Pages register cheaply; each one loads its data on the first visit.
+# Callback validation is off because it would build every page layout
+# on the first request.
+app = Dash(__name__, use_pages=True, assets_folder="pages/assets",
+    suppress_callback_exceptions=True, external_stylesheets=[dbc.themes.PULSE])
 app.title = "Sentiment analysis of applications based on LDA topic modeling"
 
+ldavis.register(app.server)
+payload.register(app.server)
+
+@app.server.route('/LDA_model')
+def LDA_model():
+    url = ldavis.url(ldavis.OUTPUT)
+    if url == ldavis.OUTPUT:
+        abort(404)
+    return redirect(url)
+
 navbar = dbc.NavbarSimple(
     brand="📱 Sentiment Analysis with Topic Modeling - LDA analysis output",
     color="primary",
@@ -17,9 +37,11 @@ body_layout = dbc.Container([
             dbc.CardBody(
                 dbc.Col([
                     html.A(dbc.Badge("Home", color="primary", className="p-3 mr-3"), href="/"),
-                    html.A(dbc.Badge("Dataset I", color="primary", className="p-3 mr-3"), href="/d1"),
-                    html.A(dbc.Badge("Dataset II", color="primary", className="p-3 mx-3"), href="/d2"),
-                    html.A(dbc.Badge("Dataset III", color="primary", className="p-3 mr-3"), href="/d3"),
+                    *[
+                    html.A(dbc.Badge(entry["label"], color="primary", className="p-3 mx-3"), href=entry["path"])
+                    for entry in store.load_manifest()
+                    ],
+                    html.A(dbc.Badge("LDA Output", color="primary", className="p-3 mx-3"), href="/dataset"),
                     ], className='d-flex flex-row')
                 ),
             className="my-3",
@@ -29,8 +51,10 @@ body_layout = dbc.Container([
     ])
 
 app.layout = html.Div([
-    navbar, body_layout
+    navbar, body_layout,
+    # Plotly template of the server-side figures, for the clientside charts
+    dcc.Store(id="plotly-template", data=pio.templates[pio.templates.default].to_plotly_json()),
     ])
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
@@ -0,0 +1,199 @@
+import math
+import re
+
+import numpy as np
+from dash import callback, ctx, dash_table, html, Input, Output, MATCH
+import dash_bootstrap_components as dbc
+
+import payload
+import store
+from pipeline import search
+
+COLUMNS = ("content", "score", "app", "topic_id", "label", "value")
+NUMERIC_COLUMNS = ["score", "topic_id", "value"]
+FACET_COLUMNS = ["app", "topic_id", "label"]
+# Component types of the pattern-matching IDs {"type": ..., "dataset": key}
+TABLE = "reviews-table"
+SEARCH = "reviews-search"
+FACETS = "reviews-facets"
+
+# Review CSV of each registered dataset
+DATASETS = {}
+PAGE_SIZE = 20
+# Filtered and sorted row orders kept in memory, one per (dataset version, filter, sort, keywords)
+QUERY_CACHE_SIZE = 64
+
+# Filter operators of the DataTable query language by their canonical name;
+# the s (case-sensitive) and i (case-insensitive) forms map to the same one
+OPERATORS = {">=": "ge", "<=": "le", "<": "lt", ">": "gt", "!=": "ne", "=": "eq"}
+OPERATORS.update({name: name for name in ["ge", "le", "lt", "gt", "ne", "eq", "contains", "datestartswith"]})
+OPERATORS.update({prefix + operator: name for operator, name in list(OPERATORS.items()) for prefix in "si"})
+# "{column} operator value": the operator is the token right after the column
+FILTER_PART = re.compile(r"^\s*\{(.+?)\}\s+(\S+)\s+(.*?)\s*$")
+
+
+@store.versioned()
+def load(dataset):
+    # topic_id stays numeric here so it filters and sorts as a number
+    return store.read_columns(dataset, list(COLUMNS))
+
+
+@store.versioned(maxsize=128)
+def rank(dataset, column, ascending=True):
+    # Dense rank of every row, computed once per column and direction; equal
+    # values share a rank so the next sort key can break the tie. int32 like
+    # the row orders, as up to 128 ranks and 64 queries stay in every worker
+    column = load(dataset)[column]
+    if column.dtype == "category":
+        column = column.cat.codes.where(column.notna())
+    elif column.name not in NUMERIC_COLUMNS:
+        column = column.astype(object)
+    ranks = column.rank(method="dense", ascending=ascending, na_option="bottom").to_numpy("int32")
+    ranks.setflags(write=False)
+    return ranks
+
+
+def split_filter_part(part):
+    # "{score} >= 4" -> ("score", "ge", 4.0)
+    match = FILTER_PART.match(part)
+    if not match or match.group(2).lower() not in OPERATORS:
+        return None, None, None
+    name, operator, value = match.group(1), OPERATORS[match.group(2).lower()], match.group(3)
+    if value and value[0] == value[-1] and value[0] in "'\"`":
+        value = value[1:-1].replace("\\" + value[0], value[0])
+    else:
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+    return name, operator, value
+
+
+def filter_mask(df, filter_query):
+    mask = np.ones(len(df), dtype=bool)
+    for part in (filter_query or "").split(" && "):
+        name, operator, value = split_filter_part(part)
+        if name not in df.columns:
+            continue
+        column = df[name]
+        if name in store.CATEGORY_COLUMNS:
+            # Match against the few categories, then select rows by code
+            categories = column.cat.categories.astype(str).str.lower()
+            value = str(value).lower()
+            if operator == "contains":
+                hits = categories.str.contains(value, regex=False)
+            elif operator == "ne":
+                hits = categories != value
+            else:
+                hits = categories == value
+            mask &= np.isin(column.cat.codes.to_numpy(), np.flatnonzero(hits))
+        elif name in NUMERIC_COLUMNS:
+            if isinstance(value, str):
+                return np.zeros(len(df), dtype=bool)
+            values = column.to_numpy()
+            mask &= {"ge": values >= value, "le": values <= value, "lt": values < value, "gt": values > value,
+                "ne": values != value}.get(operator, values == value)
+        else:
+            mask &= column.fillna("").str.contains(str(value), case=False, regex=False).to_numpy()
+    return mask
+
+
+@store.versioned(maxsize=QUERY_CACHE_SIZE)
+def query(dataset, filter_query, sort_by, keywords=""):
+    # Paging through one result only slices this array
+    rows = np.flatnonzero(filter_mask(load(dataset), filter_query)).astype("int32")
+    hits = search.search(store.load_search_index(dataset), keywords)
+    if hits is not None:
+        rows = np.intersect1d(rows, hits, assume_unique=True).astype("int32")
+    for column, direction in reversed(sort_by):
+        rows = rows[np.argsort(rank(dataset, column, direction != "desc")[rows], kind="stable")]
+    rows.setflags(write=False)
+    return rows
+
+
+def facets(dataset, rows):
+    # Rows per value of each facet column, counted over the result only
+    df = load(dataset)
+    counts = {}
+    for column in FACET_COLUMNS:
+        values = df[column]
+        if values.dtype == "category":
+            n = np.bincount(values.cat.codes.to_numpy()[rows], minlength=len(values.cat.categories))
+            counts[column] = [(v, c) for v, c in zip(values.cat.categories, n) if c]
+        else:
+            # topic_id is -1 for reviews without a topic (pipeline.inference)
+            v, n = np.unique(values.to_numpy()[rows], return_counts=True)
+            counts[column] = [(int(value), int(count)) for value, count in zip(v, n)]
+    return counts
+
+
+def facet_badges(counts):
+    return [
+        html.Div([html.Strong(column + ": ")] + [
+            dbc.Badge(f"{value} {count}", color="light", text_color="dark", className="me-1")
+            for value, count in values
+            ])
+        for column, values in counts.items()
+        ]
+
+
+def table(key, page_size=PAGE_SIZE):
+    return html.Div([
+        dbc.Input(id={"type": SEARCH, "dataset": key}, type="search", debounce=True, className="mb-2",
+            placeholder="Keywords, e.g. lag"),
+        html.Div(id={"type": FACETS, "dataset": key}, className="small mb-2"),
+        dash_table.DataTable(
+        id={"type": TABLE, "dataset": key},
+        columns=[{"name": c, "id": c, "type": "numeric" if c in NUMERIC_COLUMNS else "text"} for c in COLUMNS],
+        page_current=0,
+        page_size=page_size,
+        page_action="custom",
+        filter_action="custom",
+        filter_query="",
+        sort_action="custom",
+        sort_mode="multi",
+        sort_by=[],
+        style_table={"overflowX": "auto"},
+        style_cell={"textAlign": "left", "whiteSpace": "normal", "height": "auto", "maxWidth": "480px"},
+        ),
+        ])
+
+
+def preload():
+    # Load the rows, sort ranks and keyword index of every table up front
+    for dataset in DATASETS.values():
+        try:
+            for column in COLUMNS:
+                rank(dataset, column, True)
+                rank(dataset, column, False)
+            facets(dataset, query(dataset, "", (), ""))
+        except FileNotFoundError as e:
+            print("skipped", dataset + ":", e)
+
+
+def register_dataset(key, dataset):
+    DATASETS[key] = dataset
+
+
+# One callback serves every dataset; only the requested page and the facet
+# counts leave the server
+@callback(
+    Output({"type": TABLE, "dataset": MATCH}, "data"),
+    Output({"type": TABLE, "dataset": MATCH}, "page_count"),
+    Output({"type": TABLE, "dataset": MATCH}, "page_current"),
+    Output({"type": FACETS, "dataset": MATCH}, "children"),
+    Input({"type": TABLE, "dataset": MATCH}, "page_current"),
+    Input({"type": TABLE, "dataset": MATCH}, "page_size"),
+    Input({"type": TABLE, "dataset": MATCH}, "sort_by"),
+    Input({"type": TABLE, "dataset": MATCH}, "filter_query"),
+    Input({"type": SEARCH, "dataset": MATCH}, "value"))
+def update_table(page_current, page_size, sort_by, filter_query, keywords):
+    dataset = DATASETS[ctx.outputs_list[0]["id"]["dataset"]]
+    sort_by = tuple((s["column_id"], s["direction"]) for s in sort_by or [])
+    rows = query(dataset, filter_query or "", sort_by, keywords or "")
+    # A new filter, sort or search starts again from the first page
+    if not any(p.endswith(".page_current") for p in ctx.triggered_prop_ids):
+        page_current = 0
+    page = rows[page_current * page_size:(page_current + 1) * page_size]
+    data = payload.compact_records(load(dataset).iloc[page])
+    return data, max(1, math.ceil(len(rows) / page_size)), page_current, facet_badges(facets(dataset, rows))
@@ -0,0 +1,107 @@
+import collections
+import functools
+import hashlib
+import json
+import os
+import threading
+
+import plotly.io as pio
+
+# Figures kept in memory per process, least recently used evicted first
+MAX_ENTRIES = 64
+# Optional directory shared by all workers; figures are stored there as JSON
+CACHE_DIR = os.environ.get("FIGURE_CACHE_DIR")
+MAX_DISK_ENTRIES = 1024
+# Writes between two scans of the directory, per process
+PRUNE_EVERY = 64
+
+_memory = collections.OrderedDict()
+_lock = threading.Lock()
+_writes = 0
+
+
+def make_key(name, versions, args):
+    # The data versions are part of the key, so a changed file never hits an old figure
+    return json.dumps([name, versions, args], default=str)
+
+
+def disk_path(key):
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".json")
+
+
+def get(key):
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+    if CACHE_DIR and os.path.exists(disk_path(key)):
+        path = disk_path(key)
+        try:
+            with open(path, "r") as f:
+                figure = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        put_memory(key, figure)
+        return figure
+    return None
+
+
+def put_memory(key, figure):
+    with _lock:
+        _memory[key] = figure
+        _memory.move_to_end(key)
+        while len(_memory) > MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def put(key, figure):
+    global _writes
+    put_memory(key, figure)
+    if CACHE_DIR:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write then rename, so other workers never read half a file
+        path = disk_path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(pio.to_json(figure, validate=False))
+        os.replace(tmp, path)
+        # The directory is only over its size by what was written since the last scan
+        with _lock:
+            _writes += 1
+            due = _writes % PRUNE_EVERY == 0
+        if due:
+            prune()
+
+
+def prune():
+    # Oldest files (by last use) go first once the directory is over its size
+    entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith(".json")]
+    if len(entries) > MAX_DISK_ENTRIES:
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for e in entries[:len(entries) - MAX_DISK_ENTRIES]:
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+
+def clear():
+    with _lock:
+        _memory.clear()
+
+
+def cached(name, versions):
+    # Memoize a figure function on (data versions, name, arguments);
+    # versions(*args) returns the version of every file the figure is drawn from
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            key = make_key(name, versions(*args), args)
+            figure = get(key)
+            if figure is None:
+                figure = func(*args)
+                put(key, figure)
+            return figure
+        return wrapper
+    return decorate
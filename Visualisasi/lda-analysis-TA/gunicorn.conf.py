@@ -0,0 +1,22 @@
+# gunicorn -c gunicorn.conf.py wsgi:server
+#
+# Each worker is a process and each thread serves one request, so up to
+# workers * threads requests run at once. Callbacks spend most of their time
+# in numpy/pandas and in JSON encoding, which hold the GIL, so processes are
+# what scale CPU work; threads mainly keep a slow client or a cold cache from
+# blocking the others. Start with one worker per core and 4 threads, and
+# lower the workers if memory is short: the preloaded data is shared, but
+# every worker still builds its own figures and caches after the fork.
+# Set FIGURE_CACHE_DIR to a local directory to share drawn figures between
+# the workers (see figcache.py).
+import multiprocessing
+import os
+
+wsgi_app = "wsgi:server"
+bind = os.environ.get("BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("THREADS", 4))
+worker_class = "gthread"
+# Load the data once in the master before forking the workers
+preload_app = True
+timeout = 120
@@ -0,0 +1,174 @@
+"""pyLDAvis visualisations, split and pre-compressed at build time.
+
+    python ldavis.py
+
+Every exported pyLDAvis HTML carries its own copy of the loader script and
+the links to d3 and ldavis.js. The build keeps one shared viewer page with
+those links and writes each visualisation's data as a JSON file, so the
+browser fetches the libraries once for all of them. File names carry a
+content hash and are stored with gzip (and Brotli, when the brotli package
+is installed) next to the plain file; /ldavis/ serves the smallest variant
+the client accepts, with an ETag and a one-year immutable cache lifetime.
+"""
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from flask import abort, request, Response
+
+import store
+
+# Exported page of the LDA output page; the dataset pages' come from the manifest
+OUTPUT = "assets/lda_vis.html"
+BUILD_DIR = "ldavis"
+MANIFEST = "manifest.json"
+ROUTE = "/ldavis/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+CONTENT_TYPES = {".html": "text/html; charset=utf-8", ".json": "application/json"}
+
+DATA = re.compile(r"var (ldavis_el\w+)_data = (\{.*?\});\n", re.S)
+CSS = re.compile(r'<link rel="stylesheet" type="text/css" href="([^"]+)">')
+SCRIPTS = re.compile(r'LDAvis_load_lib\("([^"]+)"')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+VIEWER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<link rel="stylesheet" type="text/css" href="{css}">
+{scripts}
+</head>
+<body>
+<div id="ldavis" style="background-color:white;"></div>
+<script type="text/javascript">
+var data = new URLSearchParams(window.location.search).get("data");
+if (/^[\\w.-]+\\.json$/.test(data || "")) {{
+    fetch(data).then(function(r) {{ return r.json(); }}).then(function(d) {{ new LDAvis("#ldavis", d); }});
+}}
+</script>
+</body>
+</html>
+"""
+
+
+def sources():
+    # Exported pyLDAvis pages, relative to the pages folder
+    return [entry["ldavis"] for entry in store.load_manifest()] + [OUTPUT]
+
+
+def name(source):
+    return os.path.splitext(os.path.basename(source))[0]
+
+
+def parse(html):
+    # The data object, stylesheet and libraries of one exported page
+    data = DATA.search(html)
+    # Libraries in the order of their last load, d3 before ldavis.js
+    scripts = list(dict.fromkeys(SCRIPTS.findall(html)[::-1]))[::-1]
+    return json.loads(data.group(2)), CSS.search(html).group(1), scripts
+
+
+def write(folder, stem, ext, content):
+    # <stem>.<hash><ext> plus its compressed variants; returns the file name
+    filename = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+    path = os.path.join(folder, filename)
+    if not os.path.exists(path):
+        with open(path + ".gz", "wb") as f:
+            f.write(gzip.compress(content, 9, mtime=0))
+        if brotli:
+            with open(path + ".br", "wb") as f:
+                f.write(brotli.compress(content, quality=11))
+        with open(path, "wb") as f:
+            f.write(content)
+    return filename
+
+
+def build(folder=BUILD_DIR):
+    folder = store.resolve(folder)
+    os.makedirs(folder, exist_ok=True)
+    files, libraries = {}, None
+    for source in sources():
+        if not os.path.exists(store.resolve(source)):
+            continue
+        with open(store.resolve(source), "r", encoding="utf-8") as f:
+            data, css, scripts = parse(f.read())
+        if libraries and libraries != (css, scripts):
+            raise ValueError(source + " uses other pyLDAvis libraries than the other visualisations")
+        libraries = (css, scripts)
+        files[name(source)] = write(folder, name(source), ".json", json.dumps(data, separators=(",", ":")).encode())
+
+    if libraries:
+        css, scripts = libraries
+        html = VIEWER.format(css=css, scripts="\n".join(f'<script src="{s}"></script>' for s in scripts))
+        viewer = write(folder, "viewer", ".html", html.encode())
+        with open(os.path.join(folder, MANIFEST), "w") as f:
+            json.dump({"viewer": viewer, "data": files}, f, indent=2)
+    return files
+
+
+def built():
+    path = os.path.join(store.resolve(BUILD_DIR), MANIFEST)
+    paths = [store.resolve(s) for s in sources() if os.path.exists(store.resolve(s))]
+    return os.path.exists(path) and all(os.path.getmtime(s) <= os.path.getmtime(path) for s in paths)
+
+
+@store.versioned()
+def load_manifest(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def url(source):
+    # Viewer URL of a visualisation, or the exported page itself before a build
+    path = os.path.join(store.resolve(BUILD_DIR), MANIFEST)
+    if os.path.exists(path):
+        manifest = load_manifest(path)
+        if name(source) in manifest["data"]:
+            return f"{ROUTE}{manifest['viewer']}?data={manifest['data'][name(source)]}"
+    return source
+
+
+@functools.lru_cache(maxsize=64)
+def read(path):
+    with open(path, "rb") as f:
+        content = f.read()
+    return content, '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+
+
+def serve(filename):
+    path = os.path.join(store.resolve(BUILD_DIR), os.path.basename(filename))
+    ext = os.path.splitext(path)[1]
+    # Only the content-hashed files are served; the manifest is not
+    if ext not in CONTENT_TYPES or os.path.basename(path) == MANIFEST or not os.path.exists(path):
+        abort(404)
+
+    # Pick the smallest variant the client accepts; its ETag is the hash of
+    # the bytes sent, so every content coding has its own strong validator
+    headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    accepted = request.accept_encodings
+    for encoding, suffix in [("br", ".br"), ("gzip", ".gz")]:
+        if accepted[encoding] and os.path.exists(path + suffix):
+            path += suffix
+            headers["Content-Encoding"] = encoding
+            break
+    content, etag = read(path)
+    headers["ETag"] = etag
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    return Response(content, content_type=CONTENT_TYPES[ext], headers=headers)
+
+
+def register(server):
+    server.add_url_rule(ROUTE + "<filename>", "ldavis", serve)
+
+
+if __name__ == "__main__":
+    for vis, filename in build().items():
+        print(vis, "->", filename)
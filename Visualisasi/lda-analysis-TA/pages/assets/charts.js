@@ -0,0 +1,92 @@
+// Clientside versions of the radar and bar chart callbacks. The numbers
+// come from a dcc.Store filled once with the page, so changing a dropdown
+// redraws in the browser without a request to the server.
+(function() {
+    function radarLayout(template) {
+        return {
+            template: template,
+            polar: {radialaxis: {visible: true, range: [0, 100]}},
+            showlegend: true
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        charts: {
+            // Sentiment percentages of one app, per topic
+            radarApp: function(app, chart, template) {
+                var values = chart.values[chart.apps.indexOf(app)];
+                return {
+                    data: chart.sentiments.map(function(sentiment, i) {
+                        return {
+                            type: "scatterpolar",
+                            r: values.map(function(topic) { return topic[i]; }),
+                            theta: chart.topics,
+                            fill: "toself",
+                            name: sentiment
+                        };
+                    }),
+                    layout: radarLayout(template)
+                };
+            },
+
+            // Sentiment percentages of every app for one topic
+            radarTopic: function(topic, chart, template) {
+                var t = chart.topics.indexOf(topic);
+                return {
+                    data: chart.apps.map(function(app, a) {
+                        return {
+                            type: "scatterpolar",
+                            r: chart.values[a][t],
+                            theta: chart.sentiments,
+                            fill: "toself",
+                            name: app
+                        };
+                    }),
+                    layout: radarLayout(template)
+                };
+            },
+
+            // Grouped bars of the rows where `column` equals `value`, one trace per `color`
+            bar: function(value, count, column, color, template) {
+                var groups = {};
+                count[column].forEach(function(v, i) {
+                    if (String(v) !== String(value)) {
+                        return;
+                    }
+                    var key = String(count[color][i]);
+                    groups[key] = groups[key] || {x: [], y: []};
+                    groups[key].x.push(count.sentiment[i]);
+                    groups[key].y.push(count.value[i]);
+                });
+                return {
+                    data: Object.keys(groups).map(function(key) {
+                        return {
+                            type: "bar",
+                            x: groups[key].x,
+                            y: groups[key].y,
+                            name: key,
+                            legendgroup: key,
+                            offsetgroup: key,
+                            hovertemplate: color + "=" + key + "<br>sentiment=%{x}<br>value=%{y}<extra></extra>"
+                        };
+                    }),
+                    layout: {
+                        template: template,
+                        barmode: "group",
+                        legend: {title: {text: color}, tracegroupgap: 0},
+                        xaxis: {title: {text: "sentiment"}},
+                        yaxis: {title: {text: "value"}}
+                    }
+                };
+            },
+
+            barApp: function(app, count, template) {
+                return window.dash_clientside.charts.bar(app, count, "aplikasi", "topic", template);
+            },
+
+            barTopic: function(topic, count, template) {
+                return window.dash_clientside.charts.bar(topic, count, "topic", "aplikasi", template);
+            }
+        }
+    });
+})();
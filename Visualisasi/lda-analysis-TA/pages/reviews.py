@@ -0,0 +1,299 @@
+import functools
+import os
+
+import dash
+from dash import dcc, html, dash_table, clientside_callback, ClientsideFunction, Input, Output, State, MATCH
+import dash_bootstrap_components as dbc
+import plotly.express as px
+
+import explorer
+import ldavis
+import scatter
+import store
+import timeline
+
+# One page per entry of the dataset manifest; the pages share the layout
+# code below and every callback through pattern-matching IDs
+DATASETS = {entry["key"]: entry for entry in store.load_manifest()}
+tSNE_COLUMNS = ("topic_id",)
+
+
+def tsne_loader(entry):
+    columns = tSNE_COLUMNS + tuple(c + str(p) for p in entry["perplexities"] for c in "xy")
+    return functools.partial(store.load_reviews, entry["dataset"], columns)
+
+
+def layout_files(entry):
+    # Files the layout is built from; a new version of any of them rebuilds it
+    return [entry["dataset"], entry["topics"], entry["tuning"], entry["chart"]]
+
+
+@functools.lru_cache(maxsize=16)
+def build_layout(key, versions):
+    # Data is loaded on the first visit of the page, not when it is registered
+    entry = DATASETS[key]
+    df = scatter.LOADERS[key]()
+
+    # Topic Modeling LDA
+    topics_txt = store.load_topics(entry["topics"])
+    col_swatch = px.colors.qualitative.Dark24
+
+    # Topic view
+    topics_html = list()
+    for topic_html in [
+        html.Span([str(i) + ": " + topics_txt[i]], style={"color": col_swatch[i]})
+        for i in range(len(topics_txt))
+        ]:
+        topics_html.append(topic_html)
+        topics_html.append(html.Br())
+
+    # Coherence Model
+    coherence = store.load_coherence(entry["tuning"])
+
+    # Sentiment per app and topic
+    chart = store.load_chart(entry["chart"])
+
+    # t-SNE test based on perplexity
+    tSNE = df
+
+    return dbc.Container(
+        [
+        dbc.Row(
+            [
+            dbc.Col(
+                [
+                dcc.Markdown(
+                    f"""
+                    -----
+                    ##### Data:
+                    -----
+                    For this demonstration, {len(tSNE)} comments from the google play reviews were categorised into
+                    {len(topics_txt)} topics using
+                    [LDA](https://en.wikipedia.org/wiki/Latent_Dirichlet_allocation) analysis.
+
+                    Each topic is shown in different color on the citation map, as shown on the below.
+                    """
+                    )
+                ],
+                sm=12,
+                md=6,
+                ),
+            dbc.Col([
+                dcc.Markdown(
+                    """
+                    -----
+                    ##### LDA Hyperparameters
+                    -----
+                    Model hyperparameters can be thought of as settings for a machine learning algorithm that are tuned by the data scientist before training:
+                    * Number of Topics (K)
+                    * Dirichlet hyperparameter alpha: Document-Topic Density
+                    * Dirichlet hyperparameter beta: Word-Topic Density
+
+                    These hyperparameters will be evaluated using coherence values.
+
+                    """
+                    ),
+                ],
+                sm=12,
+                md=6,
+                ),
+
+            ]
+            ),
+
+        dbc.Row(
+            [
+            dbc.Col(
+                [
+                dcc.Markdown(
+                    """
+                    -----
+                    ##### Coherence Score
+                    -----
+                    """
+                    ),
+                dash_table.DataTable(
+                    coherence.to_dict('records'), [{"name": i, "id": i} for i in coherence.columns],
+                    style_table={'overflowX': 'auto'},
+                    )
+                ],
+                sm=12,
+                md=6,
+                ),
+            dbc.Col(
+                [
+                dcc.Markdown(
+                    """
+                    -----
+                    ##### Topics:
+                    -----
+                    """
+                    ),
+                html.Div(
+                    topics_html,
+                    style={
+                    "fontSize": 11,
+                    "overflow": "auto",
+                    },
+                    ),
+                ],
+                sm=12,
+                md=6,
+                ),
+            ],
+            ),
+
+        dbc.Row(
+            [
+            dcc.Markdown(
+                """
+                -----
+                ##### LDA Modeling
+                -----
+                """
+                ),
+            html.Iframe(src=ldavis.url(entry["ldavis"]),
+                className='w-100', height='750px'),
+            ],
+            ),
+
+        dbc.Row(
+            [
+            dcc.Markdown(
+                """
+                -----
+                ##### t-SNE test based on Perplexity
+                -----
+                """
+                ),
+            *scatter.tabs(key),
+            ],
+            ),
+
+        dbc.Row(
+            [
+            dcc.Markdown(
+                """
+                -----
+                ##### Filter data
+
+                Use these filters to highlight reviews with:
+                * application name, and
+                * application sentiment
+
+                -----
+                """
+                ),
+            ]
+            ),
+        dbc.Row(
+            [
+            dbc.Col(
+                [
+                dbc.Card(
+                    dbc.CardBody(
+                        [
+                        html.H4("Sentiment apps by application name", className="card-title my-3"),
+                        dcc.Dropdown(
+                            id={'type': 'categories-dropdown', 'dataset': key},
+                            options=[{'label': app, 'value': app} for app in chart.apps],
+                            value=chart.apps[0]
+                        ),
+                        dcc.Graph(id={'type': 'radar-app', 'dataset': key}),
+                        dcc.Store(id={'type': 'chart-store', 'dataset': key}, data=store.chart_data(chart)),
+                        ]
+                        ),
+                    ),
+                ],
+                sm=12,
+                md=6,
+                ),
+            dbc.Col(
+                [
+                dbc.Card(
+                    dbc.CardBody(
+                        [
+                        html.H4("Sentiment apps by topic", className="card-title my-3"),
+                        dcc.Dropdown(
+                            id={'type': 'category-dropdown', 'dataset': key},
+                            options=[{'label': topic, 'value': topic} for topic in chart.topics],
+                            value=chart.topics[0]
+                        ),
+                        dcc.Graph(id={'type': 'radar-chart', 'dataset': key})
+                        ]
+                        ),
+                    ),
+                ],
+                sm=12,
+                md=6,
+                ),
+            ]
+            ),
+        dbc.Row(
+            [
+            dcc.Markdown(
+                """
+                -----
+                ##### Sentiment over time
+                -----
+                """
+                ),
+            timeline.card(key, topics_txt),
+            ],
+            ),
+        dbc.Row(
+            [
+            dcc.Markdown(
+                """
+                -----
+                ##### Reviews
+                -----
+                Filter each column with text such as `tinder`, `negative` or `> 3`.
+                """
+                ),
+            explorer.table(key),
+            ],
+            ),
+        ],
+        )
+
+
+def unavailable(key, error):
+    return dbc.Container(dbc.Alert(
+        [html.H4(DATASETS[key]["label"] + " is not available", className="alert-heading"),
+        html.P("Its data files have not been built yet: " + os.path.relpath(error.filename, store.BASE_DIR))],
+        color="warning", className="my-3"))
+
+
+def layout(key, **kwargs):
+    # A manifest entry whose files are not there yet gets a notice, not a 500
+    try:
+        return build_layout(key, store.data_versions(layout_files(DATASETS[key])))
+    except FileNotFoundError as e:
+        return unavailable(key, e)
+
+
+# The radar charts are drawn in the browser from the chart store
+clientside_callback(
+    ClientsideFunction(namespace='charts', function_name='radarApp'),
+    Output({'type': 'radar-app', 'dataset': MATCH}, 'figure'),
+    Input({'type': 'categories-dropdown', 'dataset': MATCH}, 'value'),
+    State({'type': 'chart-store', 'dataset': MATCH}, 'data'),
+    State('plotly-template', 'data'),
+)
+
+clientside_callback(
+    ClientsideFunction(namespace='charts', function_name='radarTopic'),
+    Output({'type': 'radar-chart', 'dataset': MATCH}, 'figure'),
+    Input({'type': 'category-dropdown', 'dataset': MATCH}, 'value'),
+    State({'type': 'chart-store', 'dataset': MATCH}, 'data'),
+    State('plotly-template', 'data'),
+)
+
+
+for key, entry in DATASETS.items():
+    dash.register_page("pages." + key.upper(), path=entry["path"], title=entry["title"],
+        layout=functools.partial(layout, key))
+    scatter.register_dataset(key, entry["dataset"], tsne_loader(entry), entry["perplexities"])
+    explorer.register_dataset(key, entry["dataset"])
+    timeline.register_dataset(key, entry["dataset"])
@@ -0,0 +1,115 @@
+"""Compact JSON for figures and Store data, and a report of what it saves.
+
+    python payload.py /d1 /d3 /dataset
+
+Figure arrays are sent as float32 rounded to DECIMALS places, which orjson
+writes in their shortest form. With TYPED_ARRAYS they are sent as base64
+typed arrays ({"dtype": "f4", "bdata": ...}) instead; that needs plotly.js
+2.28 or newer in the browser, and the plotly.js bundled with dash 2.15 is
+2.25, so it is off unless FIGURE_TYPED_ARRAYS=1.
+"""
+import base64
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.io as pio
+from flask import g, request
+from plotly.io.json import to_json_plotly
+
+DECIMALS = int(os.environ.get("FIGURE_DECIMALS", 3))
+TYPED_ARRAYS = os.environ.get("FIGURE_TYPED_ARRAYS") == "1"
+# Trace attributes holding one number per point
+ARRAY_KEYS = ["x", "y", "z", "r", "customdata"]
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    orjson = None
+
+
+def compact_array(values, decimals=DECIMALS, typed=TYPED_ARRAYS):
+    array = np.asarray(values)
+    if array.dtype.kind != "f":
+        return values
+    array = np.round(array.astype("float32"), decimals)
+    if typed:
+        return {"dtype": "f4", "bdata": base64.b64encode(array.tobytes()).decode("ascii"), "shape": list(array.shape)}
+    # The json engine writes float32 with the digits of its float64 value
+    # (-81.53500366210938); rounded float64 keeps the short form there
+    return array if orjson else np.round(array.astype("float64"), decimals)
+
+
+def compact_figure(fig, decimals=DECIMALS, typed=TYPED_ARRAYS):
+    # Figure dict with every float array of the traces made compact
+    figure = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else fig
+    for trace in figure["data"]:
+        for key in ARRAY_KEYS:
+            if key in trace and trace[key] is not None:
+                trace[key] = compact_array(trace[key], decimals, typed)
+    return figure
+
+
+def compact_records(df, decimals=DECIMALS):
+    # Table rows for a Store or DataTable; float32 columns would otherwise
+    # be written with the digits of their float64 conversion
+    floats = df.select_dtypes("floating").columns
+    return df.astype({c: "float64" for c in floats}).round(decimals).to_dict("records")
+
+
+def encode(value, engine=None):
+    start = time.perf_counter()
+    data = to_json_plotly(value, engine=engine)
+    return len(data.encode()), time.perf_counter() - start
+
+
+def register(server):
+    # Log the size and time of every Dash response, per callback output
+    @server.before_request
+    def start_timer():
+        g.payload_start = time.perf_counter()
+
+    @server.after_request
+    def log_payload(response):
+        if request.path.startswith("/_dash-") and logger.isEnabledFor(logging.INFO):
+            output = (request.get_json(silent=True) or {}).get("output", request.path)
+            logger.info("%s %d bytes %.1f ms", output, response.calculate_content_length() or 0,
+                (time.perf_counter() - g.payload_start) * 1000)
+        return response
+
+
+def report(paths):
+    import app
+    import scatter
+
+    client = app.app.server.test_client()
+    deps = client.get("/_dash-dependencies").get_json()
+    pages = next(d for d in deps if "_pages_content" in d["output"])
+    outputs = [dict(zip(["id", "property"], o.split("."))) for o in pages["output"].strip(".").split("...")]
+    for path in paths:
+        body = {"output": pages["output"], "outputs": outputs, "changedPropIds": ["_pages_location.pathname"],
+            "inputs": [{"id": "_pages_location", "property": "pathname", "value": path},
+            {"id": "_pages_location", "property": "search", "value": ""}],
+            "state": [{"id": "_pages_location", "property": "hash", "value": ""}] if pages.get("state") else []}
+        start = time.perf_counter()
+        response = client.post("/_dash-update-component", json=body)
+        print(f"{path} layout: {len(response.data) / 1024:.1f} KB, {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        key = path.strip("/")
+        for perplexity in scatter.PERPLEXITIES.get(key, []):
+            fig = scatter.draw(scatter.LOADERS[key](), perplexity)
+            rows = [("json", encode(fig.to_plotly_json(), "json")),
+                ("orjson", encode(fig.to_plotly_json(), "orjson")),
+                (f"{DECIMALS} decimals", encode(compact_figure(fig, typed=False))),
+                ("typed arrays", encode(compact_figure(fig, typed=True)))]
+            print(f"  t-SNE perplexity {perplexity}: " + ", ".join(
+                f"{name} {size / 1024:.1f} KB {seconds * 1000:.1f} ms" for name, (size, seconds) in rows))
+
+
+if __name__ == "__main__":
+    report(sys.argv[1:] or ["/d1", "/d3", "/dataset"])
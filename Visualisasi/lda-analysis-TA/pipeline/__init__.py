@@ -0,0 +1,25 @@
+# Offline stages that produce the files under pages/dataset and pages/output.
+# Run them from the app folder, e.g. `python -m pipeline.sentiment --help`.
+import contextlib
+import os
+import threading
+
+import numpy as np
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    # Temporary name to write instead of `path`, renamed over it once written;
+    # processes that read or memory map `path` meanwhile see the old file whole
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def save_array(path, array):
+    with atomic_path(path) as tmp, open(tmp, "wb") as f:
+        np.save(f, array)
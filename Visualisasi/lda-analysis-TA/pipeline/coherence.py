@@ -0,0 +1,136 @@
+import argparse
+import collections
+import json
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import sparse
+
+import store
+
+# Sliding window of each measure, as in gensim; None counts whole documents
+WINDOWS = {"u_mass": None, "c_v": 110, "c_npmi": 10}
+EPSILON = 1e-12
+# Documents turned into one sparse window matrix at a time
+CHUNK_SIZE = 10000
+
+# n (virtual) documents and a symmetric co-occurrence matrix whose diagonal
+# holds the occurrences of each word
+Counts = collections.namedtuple("Counts", ["n", "cooccurrences"])
+Index = collections.namedtuple("Index", ["vocab", "counts"])
+
+
+def count(docs, vocab_size, window=None):
+    n = 0
+    cooccurrences = sparse.csr_matrix((vocab_size, vocab_size), dtype="int64")
+    for start in range(0, len(docs), CHUNK_SIZE):
+        base, rows, cols = n, [], []
+        for ids in docs[start:start + CHUNK_SIZE]:
+            # Documents no longer than the window are a single window
+            if window is None or len(ids) <= window:
+                rows.append(np.full(len(ids), n - base))
+                cols.append(ids)
+                n += 1
+            else:
+                windows = sliding_window_view(ids, window)
+                rows.append(np.repeat(np.arange(n - base, n - base + len(windows)), window))
+                cols.append(windows.ravel())
+                n += len(windows)
+
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        # One row per window, 1 where the word occurs in it
+        occurs = sparse.csr_matrix((np.ones(len(rows), dtype="int32"), (rows, cols)), shape=(n - base, vocab_size))
+        occurs.sum_duplicates()
+        occurs.data[:] = 1
+        cooccurrences = cooccurrences + (occurs.T @ occurs).astype("int64")
+    return Counts(n, cooccurrences.tocsr())
+
+
+def build_index(texts):
+    # The corpus is scanned here once; every later score is a lookup
+    vocab = {}
+    docs = [np.array([vocab.setdefault(w, len(vocab)) for w in text], dtype="int32") for text in texts]
+    counts = {measure: count(docs, len(vocab), window) for measure, window in WINDOWS.items()}
+    return Index(vocab, counts)
+
+
+def save_index(index, path):
+    arrays = {"vocab": np.array(list(index.vocab), dtype=str)}
+    for measure, counts in index.counts.items():
+        arrays[measure + "_n"] = np.array(counts.n)
+        arrays[measure + "_data"] = counts.cooccurrences.data
+        arrays[measure + "_indices"] = counts.cooccurrences.indices
+        arrays[measure + "_indptr"] = counts.cooccurrences.indptr
+    np.savez(path, **arrays)
+
+
+def load_index(path):
+    with np.load(path) as f:
+        vocab = {w: i for i, w in enumerate(f["vocab"].tolist())}
+        counts = {}
+        for measure in WINDOWS:
+            matrix = (f[measure + "_data"], f[measure + "_indices"], f[measure + "_indptr"])
+            counts[measure] = Counts(int(f[measure + "_n"]), sparse.csr_matrix(matrix, shape=(len(vocab), len(vocab))))
+    return Index(vocab, counts)
+
+
+def npmi(co, occurrences, n):
+    joint = co / n + EPSILON
+    p = occurrences / n
+    return np.log(joint / np.outer(p, p)) / -np.log(joint)
+
+
+def topic_score(index, topic, measure):
+    ids = [index.vocab[w] for w in topic if w in index.vocab]
+    counts = index.counts[measure]
+    co = counts.cooccurrences[ids][:, ids].toarray().astype("float64")
+    occurrences = np.diag(co)
+
+    if measure == "u_mass":
+        # Each word against the words ranked above it
+        i, j = np.tril_indices(len(ids), -1)
+        return np.mean(np.log((co[i, j] / counts.n + EPSILON) / (occurrences[j] / counts.n)))
+    m = npmi(co, occurrences, counts.n)
+    if measure == "c_npmi":
+        return np.mean(m[~np.eye(len(ids), dtype=bool)])
+    # c_v: cosine between each word's NPMI vector and the whole topic's
+    topic_vector = m.sum(axis=0)
+    cos = m @ topic_vector / (np.linalg.norm(m, axis=1) * np.linalg.norm(topic_vector))
+    return np.mean(cos)
+
+
+def coherence(index, topics, measure="c_v"):
+    return float(np.mean([topic_score(index, topic, measure) for topic in topics]))
+
+
+def read_topics(json_path):
+    # lda_topics.json style: {"0": ["0.338*\"bagus\"", ...], ...}
+    with open(store.resolve(json_path), "r") as f:
+        lda_topics = json.load(f)
+    return [[j.split("*")[1].replace('"', "") for j in lda_topics[str(i)]] for i in range(len(lda_topics))]
+
+
+def read_texts(reviews, text_column="stem"):
+    texts = pd.read_csv(store.resolve(reviews), usecols=[text_column])[text_column]
+    return [str(t).split() for t in texts.fillna("")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Co-occurrence index for topic coherence")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="scan the reference texts once and save the index")
+    build.add_argument("reviews")
+    build.add_argument("index", help="output .npz")
+    build.add_argument("--text-column", default="stem")
+    score = sub.add_parser("score", help="score the topics of a topics JSON")
+    score.add_argument("index")
+    score.add_argument("topics")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        save_index(build_index(read_texts(args.reviews, args.text_column)), args.index)
+    else:
+        index, topics = load_index(args.index), read_topics(args.topics)
+        for measure in WINDOWS:
+            print(measure, coherence(index, topics, measure))
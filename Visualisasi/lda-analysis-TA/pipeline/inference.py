@@ -0,0 +1,107 @@
+import argparse
+import collections
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from gensim.models import LdaModel
+
+import store
+from pipeline import preprocess, topics
+
+# Reviews held in memory and inferred together
+CHUNK_SIZE = 4096
+# Same cut-off as LdaModel.get_document_topics, so the columns match the training output
+MINIMUM_PROBABILITY = 0.01
+# topic_id of reviews without a word of the model's vocabulary (one-word or
+# emoji-only reviews); they are kept with an empty topic_txt rather than
+# counted under topic 0
+NO_TOPIC = -1
+
+
+def load_model(path):
+    model = LdaModel.load(path)
+    return model, topics.describe(topics.from_model(model))
+
+
+def infer(model, texts, minimum_probability=MINIMUM_PROBABILITY):
+    # One variational E-step over the whole batch instead of a call per review;
+    # returns the n x K document-topic matrix
+    bows = [model.id2word.doc2bow(text) for text in texts]
+    gamma, _ = model.inference(bows)
+    theta = (gamma / gamma.sum(axis=1, keepdims=True)).astype("float32")
+    # Reviews without a known word keep an all-zero row instead of the prior
+    theta[[not bow for bow in bows]] = 0
+    theta[theta < minimum_probability] = 0
+    return theta
+
+
+def dashboard_rows(model, topics_txt, texts, minimum_probability=MINIMUM_PROBABILITY):
+    # Columns 0..K-1, topic_id and topic_txt, as in the dashboard CSVs
+    theta = infer(model, texts, minimum_probability)
+    rows = pd.DataFrame(theta, columns=[str(k) for k in range(model.num_topics)])
+    known = theta.any(axis=1)
+    rows["topic_id"] = np.where(known, theta.argmax(axis=1), NO_TOPIC)
+    rows["topic_txt"] = np.where(known, np.array(topics_txt, dtype=object)[theta.argmax(axis=1)], "")
+    return rows
+
+
+def preprocessed(contents, cache):
+    # Raw review text through the content -> text -> stem chain of pipeline.preprocess
+    counts, new = collections.Counter(), {}
+    stems = [preprocess.stem(preprocess.normalize(c), counts, new) for c in contents]
+    preprocess.append_cache(cache, new)
+    return stems
+
+
+def label_file(model_path, src, dst, text_column="stem", chunk_size=CHUNK_SIZE, raw=False, cache=preprocess.CACHE):
+    # text_column holds either text preprocessed like the training corpus (stem
+    # for the MOBA and social models, afterpos for the dating model, whose POS
+    # filtering is not repeated here) or, with raw, review text that is run
+    # through pipeline.preprocess first
+    src = store.resolve(src)
+    if text_column not in pd.read_csv(src, nrows=0).columns:
+        raise ValueError(f"{src} has no {text_column} column; pass --text-column with the column the model "
+            "was trained on, or --preprocess with the raw review text column")
+    if raw:
+        preprocess.init_worker(cache, {})
+    model, topics_txt = load_model(model_path)
+    columns = [str(k) for k in range(model.num_topics)] + ["topic_id", "topic_txt"]
+    dst = store.resolve(dst)
+    if os.path.exists(dst):
+        os.remove(dst)
+
+    done, start = 0, time.perf_counter()
+    for chunk in pd.read_csv(src, chunksize=chunk_size):
+        chunk = chunk.drop(columns=columns, errors="ignore").reset_index(drop=True)
+        texts = chunk[text_column].fillna("")
+        if raw:
+            texts = preprocessed(texts, cache)
+        texts = [str(t).split() for t in texts]
+        chunk = pd.concat([dashboard_rows(model, topics_txt, texts), chunk], axis=1)
+        chunk.to_csv(dst, mode="a", header=done == 0, index=False)
+
+        done += len(chunk)
+        print(f"{done} reviews, {done / (time.perf_counter() - start):.1f} reviews/s", flush=True)
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Infer LDA topics of new reviews with a saved model")
+    parser.add_argument("model", help="saved gensim LdaModel")
+    parser.add_argument("src", help="CSV with the review text")
+    parser.add_argument("dst", help="output CSV: topic columns 0..K-1, topic_id (-1 without known words), "
+        "topic_txt and the input columns")
+    parser.add_argument("--text-column", default="stem",
+        help="preprocessed text the model was trained on (stem, afterpos), or raw text with --preprocess")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--preprocess", action="store_true",
+        help="normalize and stem the text column with pipeline.preprocess first, e.g. --text-column content")
+    parser.add_argument("--cache", default=preprocess.CACHE, help="token to stem file of pipeline.preprocess")
+    args = parser.parse_args()
+
+    try:
+        label_file(args.model, args.src, args.dst, args.text_column, args.chunk_size, args.preprocess, args.cache)
+    except ValueError as e:
+        parser.error(str(e))
@@ -0,0 +1,167 @@
+import argparse
+import collections
+import concurrent.futures
+import csv
+import os
+import re
+import time
+
+import pandas as pd
+
+import store
+
+# Reviews per task sent to a worker, and tasks in flight per worker
+CHUNK_SIZE = 2048
+PREFETCH = 2
+# token<TAB>stem lines, appended by every run and read back by the next
+CACHE = "stem-cache.tsv"
+
+WORD = re.compile(r"[a-z0-9]+")
+# Letters repeated three or more times ("bagusss") are cut to one
+REPEAT = re.compile(r"(.)\1{2,}")
+NEGATION = "tidak"
+# Informal spellings seen in the reviews; extended by --slang
+SLANG = {
+    "ga": "tidak", "gak": "tidak", "gk": "tidak", "g": "tidak", "nggak": "tidak", "ngga": "tidak",
+    "enggak": "tidak", "engga": "tidak", "tdk": "tidak", "tak": "tidak", "jangan": "tidak", "jgn": "tidak",
+    "yg": "yang", "trs": "terus", "udah": "sudah", "udh": "sudah", "sdh": "sudah", "aj": "saja",
+    "aja": "saja", "dri": "dari", "dr": "dari", "krn": "karena", "karna": "karena", "tp": "tapi",
+    "dgn": "dengan", "jd": "jadi", "blm": "belum", "bs": "bisa", "bgt": "banget", "lg": "lagi",
+    "sy": "saya", "utk": "untuk", "ttp": "tetap", "sm": "sama", "org": "orang", "kyk": "kayak",
+    "gmn": "gimana", "dlm": "dalam", "skrg": "sekarang", "bnyk": "banyak", "msh": "masih",
+}
+
+# Slang map, stopwords and stemmer of the worker processes, plus their token cache
+_shared = {}
+
+
+def load_slang(path):
+    # Two-column CSV: informal spelling, normal form
+    with open(store.resolve(path), "r", encoding="utf-8", newline="") as f:
+        return {row[0].strip().lower(): row[1].strip().lower() for row in csv.reader(f) if len(row) >= 2}
+
+
+def load_cache(path):
+    cache = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                token, _, stem = line.rstrip("\n").partition("\t")
+                cache[token] = stem
+    return cache
+
+
+def append_cache(path, entries):
+    with open(path, "a", encoding="utf-8") as f:
+        f.writelines(f"{token}\t{stem}\n" for token, stem in entries.items())
+
+
+def init_worker(cache_path, slang):
+    from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+    _shared["slang"] = {**SLANG, **slang}
+    # Negations stay, they are merged with the next word instead
+    _shared["stopwords"] = set(StopWordRemoverFactory().get_stop_words()) - {NEGATION}
+    _shared["stemmer"] = StemmerFactory().create_stemmer()
+    _shared["cache"] = load_cache(cache_path)
+
+
+def normalize(content):
+    # content -> text: lower case words, slang replaced, stopwords dropped and
+    # every "tidak" joined to the word after it ("tidak_adil")
+    slang, stopwords = _shared["slang"], _shared["stopwords"]
+    words = [slang.get(w, w) for w in WORD.findall(REPEAT.sub(r"\1", str(content).lower()))]
+    tokens, negate = [], False
+    for word in words:
+        if word == NEGATION:
+            negate = True
+        elif word not in stopwords:
+            tokens.append(NEGATION + "_" + word if negate else word)
+            negate = False
+        elif negate:
+            # "tidak ada", "tidak bisa": the negated stopword is kept
+            tokens.append(NEGATION + "_" + word)
+            negate = False
+    return " ".join(tokens)
+
+
+def stem(text, counts, new):
+    # text -> stem: every part of a token stemmed once, then looked up
+    cache, stemmer = _shared["cache"], _shared["stemmer"]
+    stems = []
+    for word in text.replace("_", " ").split():
+        if word in cache:
+            counts["hits"] += 1
+        else:
+            counts["misses"] += 1
+            cache[word] = new[word] = stemmer.stem(word)
+        stems.append(cache[word])
+    return " ".join(stems)
+
+
+def process(contents):
+    # One chunk in a worker; returns both columns, the cache counts and the new stems
+    counts, new = collections.Counter(), {}
+    texts = [normalize(c) for c in contents]
+    stems = [stem(t, counts, new) for t in texts]
+    return texts, stems, counts, new
+
+
+def preprocess_file(src, dst, text_column="content", chunk_size=CHUNK_SIZE, workers=None, cache=CACHE, slang=None):
+    # Streams the CSV through the workers in order, writing the text and stem
+    # columns next to the input columns; stems found by this run go to the cache file
+    workers = workers or os.cpu_count()
+    slang = load_slang(slang) if slang else {}
+    dst = store.resolve(dst)
+    if os.path.exists(dst):
+        os.remove(dst)
+
+    # Tokens in the cache file; a stem found by several workers is written
+    # and counted as a miss once, the other workers' lookups count as hits
+    written = set(load_cache(cache))
+    done, counts, start = 0, collections.Counter(), time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker, initargs=(cache, slang)) as pool:
+        pending = collections.deque()
+        chunks = pd.read_csv(store.resolve(src), chunksize=chunk_size)
+        while True:
+            # Keep a few chunks per worker queued, never the whole file
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(process, chunk[text_column].fillna("").tolist())))
+                if len(pending) >= workers * PREFETCH:
+                    break
+            if not pending:
+                break
+
+            chunk, future = pending.popleft()
+            texts, stems, chunk_counts, new = future.result()
+            chunk = chunk.drop(columns=["text", "stem"], errors="ignore")
+            chunk["text"], chunk["stem"] = texts, stems
+            chunk.to_csv(dst, mode="a", header=done == 0, index=False)
+            new = {token: value for token, value in new.items() if token not in written}
+            repeated = chunk_counts["misses"] - len(new)
+            chunk_counts["hits"] += repeated
+            chunk_counts["misses"] -= repeated
+            append_cache(cache, new)
+            written.update(new)
+
+            done += len(chunk)
+            counts += chunk_counts
+            lookups = counts["hits"] + counts["misses"]
+            print(f"{done} reviews, {done / (time.perf_counter() - start):.1f} reviews/s, "
+                f"cache hit rate {counts['hits'] / (lookups or 1):.1%}", flush=True)
+    return done, counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize and stem review text (content -> text -> stem)")
+    parser.add_argument("src", help="CSV with the raw review text")
+    parser.add_argument("dst", help="output CSV: the input columns plus text and stem")
+    parser.add_argument("--text-column", default="content")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--cache", default=CACHE, help="token to stem file shared across runs")
+    parser.add_argument("--slang", help="two-column CSV of extra informal spellings and their normal form")
+    args = parser.parse_args()
+
+    preprocess_file(args.src, args.dst, args.text_column, args.chunk_size, args.workers, args.cache, args.slang)
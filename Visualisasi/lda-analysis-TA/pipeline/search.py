@@ -0,0 +1,101 @@
+import argparse
+import collections
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from pipeline import save_array
+
+# Text indexed for keyword search: every one of these a dataset has, so the
+# words users type (content, text) match as well as their stems
+TEXT_COLUMNS = ["stem", "text", "content"]
+WORD = re.compile(r"\w+")
+
+# Sorted vocabulary and, for term i, the sorted row numbers
+# postings[offsets[i]:offsets[i + 1]] of the documents containing it;
+# columns names the text columns it was built from
+Index = collections.namedtuple("Index", ["vocab", "offsets", "postings", "columns"])
+
+
+def tokenize(text):
+    return WORD.findall(str(text).lower())
+
+
+def text_columns(columns):
+    return [c for c in TEXT_COLUMNS if c in columns]
+
+
+def join_columns(df, columns):
+    # One text per row with the words of all the given columns
+    return df[columns].fillna("").astype(str).agg(" ".join, axis=1)
+
+
+def build_index(texts, columns=()):
+    term_ids, terms, docs = {}, [], []
+    for doc, text in enumerate(texts):
+        if not isinstance(text, str):
+            continue
+        for term in set(tokenize(text)):
+            terms.append(term_ids.setdefault(term, len(term_ids)))
+            docs.append(doc)
+
+    # Renumber the terms alphabetically so a lookup is a binary search
+    vocab = np.array(list(term_ids), dtype=str)
+    order = np.argsort(vocab, kind="stable")
+    new_ids = np.empty(len(order), dtype="int64")
+    new_ids[order] = np.arange(len(order))
+    terms = new_ids[np.array(terms, dtype="int64")]
+    docs = np.array(docs, dtype="int32")
+
+    by_term = np.lexsort((docs, terms))
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(terms, minlength=len(vocab)))])
+    return Index(vocab[order], offsets.astype("int64"), docs[by_term], np.array(list(columns), dtype=str))
+
+
+def save_index(index, folder):
+    os.makedirs(folder, exist_ok=True)
+    for name, array in index._asdict().items():
+        save_array(os.path.join(folder, name + ".npy"), array)
+
+
+def load_index(folder, mmap=True):
+    return Index(*[np.load(os.path.join(folder, name + ".npy"), mmap_mode="r" if mmap else None)
+        for name in Index._fields])
+
+
+def index_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".search"
+
+
+def postings(index, term):
+    i = np.searchsorted(index.vocab, term)
+    if i == len(index.vocab) or index.vocab[i] != term:
+        return np.empty(0, dtype="int32")
+    return index.postings[index.offsets[i]:index.offsets[i + 1]]
+
+
+def search(index, query):
+    # Rows containing every word of the query; None when the query has no words
+    terms = set(tokenize(query))
+    if not terms:
+        return None
+    lists = sorted((postings(index, t) for t in terms), key=len)
+    rows = np.asarray(lists[0])
+    for other in lists[1:]:
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the keyword index of a review CSV")
+    parser.add_argument("reviews")
+    parser.add_argument("--text-columns", nargs="+", help="default: those of " + ", ".join(TEXT_COLUMNS))
+    parser.add_argument("--out", help="output folder, default <reviews>.search")
+    args = parser.parse_args()
+
+    columns = args.text_columns or text_columns(pd.read_csv(args.reviews, nrows=0).columns)
+    index = build_index(join_columns(pd.read_csv(args.reviews, usecols=columns), columns), columns)
+    save_index(index, args.out or index_path(args.reviews))
+    print(len(index.vocab), "terms,", len(index.postings), "postings")
@@ -0,0 +1,90 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+import store
+
+MODEL = "w11wo/indonesian-roberta-base-sentiment-classifier"
+MAX_LENGTH = 128
+# Padded tokens per forward pass; short reviews get large batches, long ones small
+BATCH_TOKENS = 8192
+MAX_BATCH = 64
+# Reviews held in memory at a time
+CHUNK_SIZE = 4096
+
+
+def load_model(name=MODEL, threads=None):
+    if threads:
+        torch.set_num_threads(threads)
+    tokenizer = AutoTokenizer.from_pretrained(name)
+    model = AutoModelForSequenceClassification.from_pretrained(name)
+    model.eval()
+    return tokenizer, model
+
+
+def length_batches(lengths, batch_tokens=BATCH_TOKENS, max_batch=MAX_BATCH):
+    # Sort by length so each batch pads to a similar size, then cut a batch
+    # whenever the padded size would go over the token budget
+    order = np.argsort(lengths, kind="stable")
+    batch = []
+    for i in order:
+        if batch and (len(batch) + 1) * lengths[i] > batch_tokens or len(batch) == max_batch:
+            yield batch
+            batch = []
+        batch.append(i)
+    if batch:
+        yield batch
+
+
+def predict(texts, tokenizer, model, max_length=MAX_LENGTH):
+    encoded = tokenizer(list(texts), truncation=True, max_length=max_length)
+    ids = encoded["input_ids"]
+    lengths = np.array([len(i) for i in ids])
+    labels = np.empty(len(ids), dtype=object)
+    values = np.empty(len(ids), dtype="float32")
+    id2label = {i: l.lower() for i, l in model.config.id2label.items()}
+
+    with torch.inference_mode():
+        for batch in length_batches(lengths):
+            inputs = tokenizer.pad({"input_ids": [ids[i] for i in batch]}, return_tensors="pt")
+            probs = torch.softmax(model(**inputs).logits, dim=-1)
+            value, label = probs.max(dim=-1)
+            labels[batch] = [id2label[i] for i in label.tolist()]
+            values[batch] = value.numpy()
+    return labels, values
+
+
+def label_file(src, dst, text_column="content", chunk_size=CHUNK_SIZE, model=MODEL, threads=None):
+    tokenizer, model = load_model(model, threads)
+    dst = store.resolve(dst)
+    if os.path.exists(dst):
+        os.remove(dst)
+
+    done, start = 0, time.perf_counter()
+    for chunk in pd.read_csv(store.resolve(src), chunksize=chunk_size):
+        chunk = chunk.drop(columns=["label", "value"], errors="ignore")
+        texts = chunk[text_column].fillna("").astype(str)
+        chunk["label"], chunk["value"] = predict(texts, tokenizer, model)
+        chunk.to_csv(dst, mode="a", header=done == 0, index=False)
+
+        done += len(chunk)
+        print(f"{done} reviews, {done / (time.perf_counter() - start):.1f} reviews/s", flush=True)
+    return done
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Label reviews with the RoBERTa sentiment classifier")
+    parser.add_argument("src", help="CSV with the review text")
+    parser.add_argument("dst", help="output CSV: the input columns plus label,value")
+    parser.add_argument("--text-column", default="content")
+    parser.add_argument("--model", default=MODEL)
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    label_file(args.src, args.dst, args.text_column, args.chunk_size, args.model, args.threads)
@@ -0,0 +1,84 @@
+import argparse
+import ast
+import collections
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipeline import save_array
+
+# Tags kept in the afterpos column: common nouns and verbs
+KEEP_TAGS = ["B-NNO", "B-VBI", "B-VBT", "B-VBP"]
+# Word-start marker of the RoBERTa tokenizer
+WORD_START = "Ġ"
+
+# POS-tagged documents as interned vocabularies plus flat id arrays;
+# document i is tokens[offsets[i]:offsets[i + 1]]
+Tokens = collections.namedtuple("Tokens", ["token_vocab", "tag_vocab", "tokens", "tags", "offsets"])
+
+
+def encode(docs):
+    # docs: iterable of [(token, tag), ...] as produced by the POS tagger
+    token_ids, tag_ids = {}, {}
+    tokens, tags, offsets = [], [], [0]
+    for doc in docs:
+        for token, tag in doc:
+            tokens.append(token_ids.setdefault(token, len(token_ids)))
+            tags.append(tag_ids.setdefault(tag, len(tag_ids)))
+        offsets.append(len(tokens))
+    return Tokens(np.array(list(token_ids), dtype=str), np.array(list(tag_ids), dtype=str),
+        np.array(tokens, dtype="int32"), np.array(tags, dtype="int32"), np.array(offsets, dtype="int64"))
+
+
+def from_postag(column):
+    # One-off conversion of the stringified postag column
+    return encode(ast.literal_eval(row) if isinstance(row, str) else [] for row in column)
+
+
+def save_tokens(t, folder):
+    os.makedirs(folder, exist_ok=True)
+    for name, array in t._asdict().items():
+        save_array(os.path.join(folder, name + ".npy"), array)
+
+
+def load_tokens(folder, mmap=True):
+    # The id arrays are memory mapped; only the vocabularies are read in full
+    mode = "r" if mmap else None
+    return Tokens(*[np.load(os.path.join(folder, name + ".npy"), mmap_mode=None if "vocab" in name else mode)
+        for name in Tokens._fields])
+
+
+def select(t, mask):
+    # Keep the tokens where mask is True, as a new Tokens with the same vocabularies
+    lengths = np.diff(t.offsets)
+    doc = np.repeat(np.arange(len(lengths)), lengths)
+    kept = np.bincount(doc[mask], minlength=len(lengths))
+    offsets = np.concatenate([[0], np.cumsum(kept)])
+    return Tokens(t.token_vocab, t.tag_vocab, t.tokens[mask], t.tags[mask], offsets)
+
+
+def afterpos(t, keep_tags=KEEP_TAGS):
+    tag_ids = np.flatnonzero(np.isin(t.tag_vocab, keep_tags))
+    return select(t, np.isin(t.tags, tag_ids))
+
+
+def texts(t):
+    # Subword pieces are glued back together; the word-start marker becomes a space
+    words = np.char.replace(t.token_vocab, WORD_START, " ")[t.tokens]
+    return ["".join(words[s:e]).strip() for s, e in zip(t.offsets[:-1], t.offsets[1:])]
+
+
+def tokens_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".tokens"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the postag column to the compact token format")
+    parser.add_argument("reviews", help="CSV with a postag column")
+    parser.add_argument("--out", help="output folder, default <reviews>.tokens")
+    args = parser.parse_args()
+
+    t = from_postag(pd.read_csv(args.reviews, usecols=["postag"])["postag"])
+    save_tokens(t, args.out or tokens_path(args.reviews))
+    print(len(t.offsets) - 1, "documents,", len(t.tokens), "tokens,", len(t.token_vocab), "types")
@@ -0,0 +1,98 @@
+import argparse
+import collections
+import json
+import os
+
+import numpy as np
+
+from pipeline import save_array
+
+# Below the 3-decimal rounding of the topics JSON
+TIE_STEP = 1e-6
+
+# Dense K x V topic-term weights and the term of each column
+TopicTerms = collections.namedtuple("TopicTerms", ["vocab", "weights"])
+
+
+def from_model(model):
+    vocab = np.array([model.id2word[i] for i in range(len(model.id2word))], dtype=str)
+    return TopicTerms(vocab, model.get_topics().astype("float32"))
+
+
+def from_topics_json(json_path):
+    # lda_topics.json only lists the top terms, so every other weight is 0.
+    # The weights are rounded to 3 decimals but listed heaviest first; a step
+    # well below the rounding keeps that order for tied terms
+    with open(json_path, "r") as f:
+        lda_topics = json.load(f)
+    rows = [[j.split("*") for j in lda_topics[str(i)]] for i in range(len(lda_topics))]
+    vocab = list(dict.fromkeys(term.replace('"', "") for row in rows for _, term in row))
+    index = {term: i for i, term in enumerate(vocab)}
+    weights = np.zeros((len(rows), len(vocab)), dtype="float32")
+    for k, row in enumerate(rows):
+        for rank, (weight, term) in enumerate(row):
+            weights[k, index[term.replace('"', "")]] = float(weight) - rank * TIE_STEP
+    return TopicTerms(np.array(vocab, dtype=str), weights)
+
+
+def save_topic_terms(tt, folder):
+    os.makedirs(folder, exist_ok=True)
+    # weights.npy last: store.load_topic_terms checks it for freshness
+    save_array(os.path.join(folder, "vocab.npy"), tt.vocab)
+    save_array(os.path.join(folder, "weights.npy"), tt.weights)
+
+
+def load_topic_terms(folder, mmap=True):
+    return TopicTerms(np.load(os.path.join(folder, "vocab.npy")),
+        np.load(os.path.join(folder, "weights.npy"), mmap_mode="r" if mmap else None))
+
+
+def topic_terms_path(path):
+    return os.path.splitext(path)[0] + ".topics"
+
+
+def top_terms(tt, n=10):
+    # K x n term indices, heaviest first; ties keep vocabulary order
+    return np.argsort(-tt.weights, axis=1, kind="stable")[:, :n]
+
+
+def term_weights(tt, terms):
+    # K x len(terms); unknown terms weigh 0
+    index = {term: i for i, term in enumerate(tt.vocab.tolist())}
+    cols = np.array([index.get(t, -1) for t in terms])
+    weights = np.where(cols >= 0, tt.weights[:, np.maximum(cols, 0)], 0)
+    return weights.astype("float32")
+
+
+def similarity(tt, metric="cosine"):
+    # K x K topic similarity
+    w = np.asarray(tt.weights, dtype="float64")
+    if metric == "cosine":
+        w = w / np.maximum(np.linalg.norm(w, axis=1, keepdims=True), 1e-12)
+        return w @ w.T
+    # 1 - Jensen-Shannon distance over the normalized term distributions
+    p = w / np.maximum(w.sum(axis=1, keepdims=True), 1e-12)
+    m = (p[:, None, :] + p[None, :, :]) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kl = np.where(p[:, None, :] > 0, p[:, None, :] * np.log2(p[:, None, :] / m), 0).sum(axis=2)
+    return 1 - np.sqrt(np.clip((kl + kl.T) / 2, 0, 1))
+
+
+def describe(tt, n=10):
+    # "term; term; ..." per topic, as shown on the dashboard
+    return ["; ".join(tt.vocab[row]) for row in top_terms(tt, n)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the LDA topic-term matrix")
+    parser.add_argument("source", help="saved gensim LdaModel, or a topics JSON")
+    parser.add_argument("--out", help="output folder, default <source>.topics")
+    args = parser.parse_args()
+
+    if args.source.endswith(".json"):
+        tt = from_topics_json(args.source)
+    else:
+        from gensim.models import LdaModel
+        tt = from_model(LdaModel.load(args.source))
+    save_topic_terms(tt, args.out or topic_terms_path(args.source))
+    print(tt.weights.shape[0], "topics,", tt.weights.shape[1], "terms")
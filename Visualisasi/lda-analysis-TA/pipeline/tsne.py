@@ -0,0 +1,246 @@
+import argparse
+import concurrent.futures
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+import store
+
+# Embedding columns are x{perplexity} and y{perplexity}
+COLUMN = re.compile(r"x(\d+)$")
+# Bisection steps of the per-point kernel width
+PERPLEXITY_STEPS = 64
+# Full runs: early exaggeration, then the free phase, as in scikit-learn's TSNE
+ITERATIONS = 1000
+EXAGGERATION = 12
+EXAGGERATION_ITERATIONS = 250
+LEARNING_RATE = 200
+MIN_GAIN = 0.01
+SEED = 0
+# Optimisation of placed points; the reference points do not move
+PLACE_ITERATIONS = 100
+PLACE_LEARNING_RATE = 1.0
+# Rows per block of the dense repulsion sums
+BLOCK_SIZE = 1024
+
+
+def topic_columns(df):
+    # Document-topic columns 0..K-1 of a dashboard CSV
+    return sorted((c for c in df.columns if str(c).isdigit()), key=int)
+
+
+def perplexities(df):
+    return sorted(int(m.group(1)) for m in map(COLUMN.match, df.columns) if m and "y" + m.group(1) in df.columns)
+
+
+def neighbour_count(perplexity, n):
+    # Three times the perplexity, as Barnes-Hut t-SNE uses
+    return int(min(n - 1, max(3 * perplexity, 5)))
+
+
+def affinities(distances, perplexity, steps=PERPLEXITY_STEPS):
+    # Row-normalised Gaussian weights over each point's neighbours, with the
+    # width of every row set by bisection so its perplexity matches
+    d = distances ** 2
+    d = d - d[:, :1]
+    target = np.log(perplexity)
+    lo = np.full(len(d), -np.inf)
+    hi = np.full(len(d), np.inf)
+    beta = np.ones(len(d))
+    for _ in range(steps):
+        p = np.exp(-d * beta[:, None])
+        total = p.sum(axis=1)
+        entropy = np.log(total) + beta * (d * p).sum(axis=1) / total
+        # Entropy falls as beta grows
+        high = entropy > target
+        lo = np.where(high, beta, lo)
+        hi = np.where(high, hi, beta)
+        beta = np.where(high, np.where(np.isinf(hi), beta * 2, (beta + hi) / 2),
+            np.where(np.isinf(lo), beta / 2, (beta + lo) / 2))
+    p = np.exp(-d * beta[:, None])
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def neighbours(theta, k):
+    # k nearest other documents of every document; a document is dropped from
+    # its own list even when duplicates of it come first
+    distances, idx = cKDTree(theta).query(theta, k=k + 1)
+    own = idx == np.arange(len(theta))[:, None]
+    own[~own.any(axis=1), -1] = True
+    return distances[~own].reshape(len(theta), k), idx[~own].reshape(len(theta), k)
+
+
+def joint_affinities(distances, idx, perplexity):
+    # Symmetric P of one perplexity from the first columns of the shared kNN graph
+    n = len(idx)
+    k = neighbour_count(perplexity, n)
+    p = affinities(distances[:, :k], perplexity)
+    P = sparse.csr_matrix((p.ravel(), idx[:, :k].ravel(), np.arange(0, n * k + 1, k)), shape=(n, n))
+    P = P + P.T
+    return (P / P.sum()).tocoo()
+
+
+def repulsion(y):
+    # Unnormalised repulsive forces and the normalisation Z, exact over all
+    # pairs in blocks; fine for the few thousand reviews of a dataset
+    sq = (y * y).sum(axis=1)
+    forces = np.empty_like(y)
+    z = 0.0
+    for start in range(0, len(y), BLOCK_SIZE // 2):
+        block = slice(start, start + BLOCK_SIZE // 2)
+        q = y[block] @ (-2 * y.T)
+        q += sq[None, :]
+        q += sq[block, None]
+        q += 1
+        np.reciprocal(q, out=q)
+        z += q.sum(dtype="float64")
+        q *= q
+        forces[block] = y[block] * q.sum(axis=1, keepdims=True) - q @ y
+    # q_ii = 1 for every point
+    return forces, z - len(y)
+
+
+def optimise(P, iterations=ITERATIONS, seed=SEED):
+    # Gradient descent with momentum and per-coordinate gains; returns the
+    # embedding and the seconds spent
+    start = time.perf_counter()
+    n = P.shape[0]
+    rows, cols, values = P.row, P.col, P.data.astype("float32")
+    y = (np.random.default_rng(seed).standard_normal((n, 2)) * 1e-4).astype("float32")
+    update = np.zeros_like(y)
+    gains = np.ones_like(y)
+    for i in range(iterations):
+        exaggeration = EXAGGERATION if i < EXAGGERATION_ITERATIONS else 1
+        momentum = 0.5 if i < EXAGGERATION_ITERATIONS else 0.8
+        diff = y[rows] - y[cols]
+        weights = exaggeration * values / (1 + (diff ** 2).sum(axis=1))
+        attract = np.stack([np.bincount(rows, weights * diff[:, d], minlength=n) for d in range(2)], axis=1)
+        repel, z = repulsion(y)
+        grad = 4 * (attract - repel / z).astype("float32")
+
+        grow = np.sign(grad) != np.sign(update)
+        gains = np.maximum(np.where(grow, gains + 0.2, gains * 0.8), MIN_GAIN)
+        update = momentum * update - LEARNING_RATE * gains * grad
+        y += update
+    return y, time.perf_counter() - start
+
+
+def fit(theta, perplexities, workers=None, iterations=ITERATIONS):
+    # Embeddings of every perplexity from one kNN search at the largest
+    # neighbourhood; the optimisations run in parallel processes.
+    # Returns {perplexity: n x 2} and the seconds of every stage
+    timings = {}
+    start = time.perf_counter()
+    distances, idx = neighbours(theta, neighbour_count(max(perplexities), len(theta)))
+    timings["neighbours"] = time.perf_counter() - start
+
+    affinity = {}
+    for perplexity in perplexities:
+        start = time.perf_counter()
+        affinity[perplexity] = joint_affinities(distances, idx, perplexity)
+        timings[f"affinities {perplexity}"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    embeddings = {}
+    with concurrent.futures.ProcessPoolExecutor(min(workers or os.cpu_count(), len(perplexities))) as pool:
+        futures = {pool.submit(optimise, affinity[p], iterations): p for p in perplexities}
+        for future in concurrent.futures.as_completed(futures):
+            perplexity = futures[future]
+            embeddings[perplexity], timings[f"optimise {perplexity}"] = future.result()
+    timings["optimise (wall)"] = time.perf_counter() - start
+    return embeddings, timings
+
+
+def fit_file(src, dst, perplexities, workers=None, iterations=ITERATIONS):
+    # Writes x{p}/y{p} for every perplexity, replacing columns of the same name
+    df = pd.read_csv(store.resolve(src))
+    theta = df[topic_columns(df)].to_numpy("float64")
+    embeddings, timings = fit(theta, perplexities, workers, iterations)
+    for perplexity in sorted(embeddings):
+        df["x" + str(perplexity)], df["y" + str(perplexity)] = embeddings[perplexity].T
+    df.to_csv(store.resolve(dst), index=False)
+
+    for stage, seconds in timings.items():
+        print(f"{stage}: {seconds:.2f} s", flush=True)
+    return df
+
+
+def place(reference_theta, reference_xy, theta, perplexity, iterations=PLACE_ITERATIONS,
+        learning_rate=PLACE_LEARNING_RATE):
+    # Positions of new documents in an existing embedding. Each starts at the
+    # affinity-weighted mean of its nearest reference documents in topic space,
+    # then moves by the t-SNE gradient against the fixed reference points
+    k = neighbour_count(perplexity, len(reference_theta) + 1)
+    distances, idx = cKDTree(reference_theta).query(theta, k=k)
+    distances, idx = distances.reshape(len(theta), k), idx.reshape(len(theta), k)
+    p = affinities(distances, perplexity)
+    y = np.einsum("ik,ikd->id", p, reference_xy[idx])
+
+    update = np.zeros_like(y)
+    for i in range(iterations):
+        for start in range(0, len(y), BLOCK_SIZE):
+            block = slice(start, start + BLOCK_SIZE)
+            # Attraction to the neighbours, repulsion from every reference point,
+            # each normalised per new point since they do not interact
+            diff = y[block, None, :] - reference_xy[idx[block]]
+            q = 1 / (1 + (diff ** 2).sum(axis=2))
+            attract = np.einsum("ik,ikd->id", p[block] * q, diff)
+            diff = y[block, None, :] - reference_xy[None, :, :]
+            q = 1 / (1 + (diff ** 2).sum(axis=2))
+            repel = np.einsum("ik,ikd->id", q ** 2, diff) / q.sum(axis=1, keepdims=True)
+            momentum = 0.5 if i < iterations // 4 else 0.8
+            update[block] = momentum * update[block] - learning_rate * 4 * (attract - repel)
+        y += update
+    return y
+
+
+def place_file(reference, new, dst, iterations=PLACE_ITERATIONS):
+    # Appends the reviews of `new` (topic columns from pipeline.inference) to the
+    # reference dashboard CSV with positions in each of its embeddings; the rows
+    # already there are written back unchanged
+    ref = pd.read_csv(store.resolve(reference))
+    df = pd.read_csv(store.resolve(new))
+    columns = topic_columns(ref)
+    if topic_columns(df) != columns:
+        raise ValueError(new + " has other topic columns than " + reference)
+    reference_theta = ref[columns].to_numpy("float64")
+    theta = df[columns].to_numpy("float64")
+
+    for perplexity in perplexities(ref):
+        x, y = "x" + str(perplexity), "y" + str(perplexity)
+        start = time.perf_counter()
+        df[[x, y]] = place(reference_theta, ref[[x, y]].to_numpy("float64"), theta, perplexity, iterations)
+        print(f"perplexity {perplexity}: {len(df)} reviews placed in {time.perf_counter() - start:.2f} s", flush=True)
+
+    out = pd.concat([ref, df[[c for c in ref.columns if c in df.columns]]], ignore_index=True)
+    out.to_csv(store.resolve(dst), index=False)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="t-SNE embeddings of the document-topic matrix")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_fit = commands.add_parser("fit", help="embed every review at each perplexity")
+    parser_fit.add_argument("src", help="dashboard CSV with topic columns 0..K-1")
+    parser_fit.add_argument("dst", help="output CSV with x{p}/y{p} columns added")
+    parser_fit.add_argument("--perplexities", type=int, nargs="+", default=[1, 10, 25, 100])
+    parser_fit.add_argument("--workers", type=int, default=os.cpu_count())
+    parser_fit.add_argument("--iterations", type=int, default=ITERATIONS)
+
+    parser_place = commands.add_parser("place", help="place new reviews in the existing embeddings")
+    parser_place.add_argument("reference", help="dashboard CSV with topic columns and x{p}/y{p} columns")
+    parser_place.add_argument("new", help="CSV with the topic columns of the new reviews")
+    parser_place.add_argument("dst", help="output CSV: the reference rows followed by the placed rows")
+    parser_place.add_argument("--iterations", type=int, default=PLACE_ITERATIONS)
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        fit_file(args.src, args.dst, args.perplexities, args.workers, args.iterations)
+    elif args.command == "place":
+        place_file(args.reference, args.new, args.dst, args.iterations)
@@ -0,0 +1,185 @@
+import argparse
+import concurrent.futures
+import csv
+import os
+
+import numpy as np
+from gensim import corpora, utils
+from gensim.models import LdaModel
+
+import store
+from pipeline import coherence
+
+COLUMNS = ["Validation_Set", "Topics", "Alpha", "Beta", "Coherence"]
+
+# Same grid as the lda_tuning_*.csv files
+TOPICS = range(2, 10)
+ALPHA = list(np.arange(0.1, 1, 0.3)) + ["symmetric", "asymmetric"]
+BETA = list(np.arange(0.1, 1, 0.3)) + ["symmetric"]
+VALIDATION_SETS = {"75% Corpus": 0.75, "100% Corpus": 1.0}
+PASSES = 10
+TOPN = 10
+
+# Successive halving: every candidate starts with MIN_PASSES and the best
+# 1/ETA of each round gets ETA times the passes, up to PASSES
+MIN_PASSES = 1
+ETA = 3
+HALVING_SET = "75% Corpus"
+
+# Corpus shared by the worker processes, loaded once per process
+_shared = {}
+
+
+def prepare(reviews, workdir, text_column="stem"):
+    # Tokenize once and serialize the dictionary, corpus and coherence index for the workers
+    os.makedirs(workdir, exist_ok=True)
+    texts = coherence.read_texts(reviews, text_column)
+
+    dictionary = corpora.Dictionary(texts)
+    dictionary.save(os.path.join(workdir, "dictionary.gensim"))
+    corpora.MmCorpus.serialize(os.path.join(workdir, "corpus.mm"), [dictionary.doc2bow(t) for t in texts])
+    coherence.save_index(coherence.build_index(texts), os.path.join(workdir, "coherence.npz"))
+
+
+def init_worker(workdir, measure="c_v"):
+    _shared["dictionary"] = corpora.Dictionary.load(os.path.join(workdir, "dictionary.gensim"))
+    _shared["corpus"] = corpora.MmCorpus(os.path.join(workdir, "corpus.mm"))
+    _shared["index"] = coherence.load_index(os.path.join(workdir, "coherence.npz"))
+    _shared["measure"] = measure
+
+
+def validation_corpus(validation_set):
+    corpus = _shared["corpus"]
+    return utils.ClippedCorpus(corpus, int(len(corpus) * VALIDATION_SETS[validation_set]))
+
+
+def train(validation_set, k, alpha, beta, passes=PASSES):
+    return LdaModel(corpus=validation_corpus(validation_set), id2word=_shared["dictionary"],
+        num_topics=k, random_state=100, chunksize=100, passes=passes, alpha=alpha, eta=beta)
+
+
+def score(model):
+    # Top terms are looked up in the shared index instead of rescanning the texts
+    topics = [[w for w, _ in model.show_topic(t, topn=TOPN)] for t in range(model.num_topics)]
+    return coherence.coherence(_shared["index"], topics, _shared["measure"])
+
+
+def run_point(point, passes=PASSES):
+    validation_set, k, alpha, beta = point
+    return [validation_set, k, alpha, beta, score(train(validation_set, k, alpha, beta, passes))]
+
+
+def run_budget(point, passes, workdir):
+    # Continue the candidate's saved model up to `passes` instead of retraining it
+    validation_set, k, alpha, beta = point
+    path = os.path.join(workdir, "models", "_".join(key(point)).replace(" ", "").replace("%", "") + ".gensim")
+    if os.path.exists(path):
+        model = LdaModel.load(path)
+        if model.passes < passes:
+            model.update(validation_corpus(validation_set), passes=passes - model.passes)
+            model.passes = passes
+    else:
+        model = train(validation_set, k, alpha, beta, passes)
+    model.save(path)
+    return [validation_set, k, alpha, beta, score(model), passes]
+
+
+def grid():
+    return [(v, k, a, b) for v in VALIDATION_SETS for k in TOPICS for a in ALPHA for b in BETA]
+
+
+def key(row):
+    # Results are matched on their CSV text, so 0.7000000000000001 stays as written
+    return tuple(str(v) for v in row[:4])
+
+
+def finished(results):
+    return {key(row) for row in read_rows(results) if len(row) >= len(COLUMNS)}
+
+
+def read_rows(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        return list(csv.reader(f))[1:]
+
+
+def append_row(results, row, columns=COLUMNS):
+    new = not os.path.exists(results)
+    with open(results, "a", newline="") as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(columns)
+        writer.writerow(row)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def sweep(workdir, results, workers=None, passes=PASSES, measure="c_v"):
+    results = store.resolve(results)
+    done = finished(results)
+    pending = [p for p in grid() if key(p) not in done]
+    print(f"{len(done)} points done, {len(pending)} to run", flush=True)
+
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker, initargs=(workdir, measure)) as pool:
+        futures = [pool.submit(run_point, p, passes) for p in pending]
+        for future in concurrent.futures.as_completed(futures):
+            row = future.result()
+            append_row(results, row)
+            print(*row, flush=True)
+
+
+def halving(workdir, results, workers=None, min_passes=MIN_PASSES, max_passes=PASSES, eta=ETA, measure="c_v"):
+    # Every evaluation is logged in the work directory so a restart resumes
+    # inside a round; a candidate goes to the results once its budget is final
+    results = store.resolve(results)
+    columns = COLUMNS + ["Passes"]
+    log = os.path.join(workdir, "halving.csv")
+    os.makedirs(os.path.join(workdir, "models"), exist_ok=True)
+    scores = {(key(row), int(row[5])): float(row[4]) for row in read_rows(log) if len(row) == len(columns)}
+    reported = finished(results)
+
+    candidates = [(HALVING_SET, k, a, b) for k in TOPICS for a in ALPHA for b in BETA]
+    passes = min_passes
+    with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker, initargs=(workdir, measure)) as pool:
+        while True:
+            pending = [c for c in candidates if (key(c), passes) not in scores]
+            print(f"{len(candidates)} candidates at {passes} passes, {len(pending)} to run", flush=True)
+            futures = [pool.submit(run_budget, c, passes, workdir) for c in pending]
+            for future in concurrent.futures.as_completed(futures):
+                row = future.result()
+                append_row(log, row, columns)
+                scores[(key(row), passes)] = row[4]
+
+            ranked = sorted(candidates, key=lambda c: scores[(key(c), passes)], reverse=True)
+            last = passes >= max_passes or len(ranked) <= 1
+            survivors = ranked if last else ranked[:max(1, len(ranked) // eta)]
+            for c in (ranked if last else ranked[len(survivors):]):
+                if key(c) not in reported:
+                    append_row(results, list(c) + [scores[(key(c), passes)], passes], columns)
+            if last:
+                return ranked[0]
+            candidates, passes = survivors, min(passes * eta, max_passes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LDA hyperparameter grid search, resumable")
+    parser.add_argument("reviews", help="CSV with the preprocessed review text")
+    parser.add_argument("results", help="results CSV; finished rows are skipped on restart")
+    parser.add_argument("--workdir", default="tuning-cache", help="serialized corpus shared by the workers")
+    parser.add_argument("--text-column", default="stem")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--passes", type=int, default=PASSES)
+    parser.add_argument("--measure", choices=list(coherence.WINDOWS), default="c_v")
+    parser.add_argument("--mode", choices=["grid", "halving"], default="grid",
+        help="halving trains every candidate briefly and gives more passes only to the best")
+    parser.add_argument("--min-passes", type=int, default=MIN_PASSES)
+    parser.add_argument("--eta", type=int, default=ETA)
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.workdir, "coherence.npz")):
+        prepare(args.reviews, args.workdir, args.text_column)
+    if args.mode == "halving":
+        halving(args.workdir, args.results, args.workers, args.min_passes, args.passes, args.eta, args.measure)
+    else:
+        sweep(args.workdir, args.results, args.workers, args.passes, args.measure)
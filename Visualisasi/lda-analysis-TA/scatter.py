@@ -0,0 +1,146 @@
+import numpy as np
+import plotly.express as px
+from dash import callback, ctx, dcc, Input, Output, MATCH
+from dash.exceptions import PreventUpdate
+
+import figcache
+import payload
+import store
+
+# Upper bound of points sent to the browser for one t-SNE view
+MAX_POINTS = 5000
+# Cells per axis of the grid the points are sampled by
+GRID = 64
+
+# Component types of the pattern-matching IDs {"type": ..., "dataset": key}
+TABS = "tsne-tabs"
+GRAPH = "tsne-graph"
+
+# Review CSV, loader of the t-SNE columns and perplexity tabs of each registered dataset
+SOURCES = {}
+LOADERS = {}
+PERPLEXITIES = {}
+
+
+def view_range(relayout, axis):
+    # relayoutData holds either "xaxis.range[0]"/"xaxis.range[1]" or "xaxis.range"
+    if not relayout or relayout.get(axis + ".autorange"):
+        return None
+    if axis + ".range[0]" in relayout:
+        return [relayout[axis + ".range[0]"], relayout[axis + ".range[1]"]]
+    return relayout.get(axis + ".range")
+
+
+def downsample(df, x, y, x_range=None, y_range=None, max_points=MAX_POINTS, grid=GRID):
+    xs = df[x].to_numpy()
+    ys = df[y].to_numpy()
+
+    # Only points inside the current view are candidates
+    mask = np.ones(len(df), dtype=bool)
+    if x_range:
+        mask &= (xs >= min(x_range)) & (xs <= max(x_range))
+    if y_range:
+        mask &= (ys >= min(y_range)) & (ys <= max(y_range))
+    idx = np.flatnonzero(mask)
+    if len(idx) <= max_points:
+        return df.iloc[idx]
+
+    # Bin the view into a grid and sample every cell in proportion to its
+    # count, so the picture keeps its relative density; each cell keeps at
+    # least one point, so sparse areas and outliers survive
+    xs, ys = xs[idx], ys[idx]
+    bx = np.clip(((xs - xs.min()) / (np.ptp(xs) or 1) * grid).astype(int), 0, grid - 1)
+    by = np.clip(((ys - ys.min()) / (np.ptp(ys) or 1) * grid).astype(int), 0, grid - 1)
+    cell = bx * grid + by
+
+    # Pseudo-random order inside each cell from a hash of the row number, so a
+    # view is stable across requests and rows appended later (pipeline.tsne
+    # place) do not change which of the existing points are kept
+    priority = (idx.astype("uint64") * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    order = np.lexsort((priority, cell))
+    sorted_cells = cell[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+
+    # One point per cell, the rest of max_points shared out by count
+    ratio = max(max_points - len(counts), 0) / max(len(idx) - len(counts), 1)
+    quota = 1 + np.floor((counts - 1) * ratio).astype(int)
+
+    keep = np.sort(order[rank < np.repeat(quota, counts)])
+    return df.iloc[idx[keep]]
+
+
+def draw(df, perplexity, x_range=None, y_range=None):
+    x, y = "x" + str(perplexity), "y" + str(perplexity)
+    view = downsample(df, x, y, x_range, y_range)
+    topics = sorted(df["topic_id"].unique(), key=int)
+
+    # One WebGL trace per topic; fixed category order keeps colors stable while zooming
+    fig = px.scatter(view, x=x, y=y, color="topic_id", render_mode="webgl",
+        category_orders={"topic_id": topics})
+    fig.update_layout(uirevision=perplexity)
+    if x_range:
+        fig.update_xaxes(range=x_range)
+    if y_range:
+        fig.update_yaxes(range=y_range)
+    return fig
+
+
+def tsne_figure(df, perplexity, x_range=None, y_range=None):
+    return payload.compact_figure(draw(df, perplexity, x_range, y_range))
+
+
+# Only the full views are cached; zoom and pan ranges are continuous and
+# almost never repeat, so they would just push these out
+@figcache.cached("tsne", lambda key, *args: [store.data_version(SOURCES[key])])
+def cached_figure(key, perplexity):
+    return tsne_figure(LOADERS[key](), perplexity)
+
+
+def preload():
+    # Draw every full-view figure up front, e.g. before the server forks
+    for key, perplexities in PERPLEXITIES.items():
+        try:
+            for perplexity in perplexities:
+                cached_figure(key, perplexity)
+        except FileNotFoundError as e:
+            print("skipped", key + ":", e)
+
+
+def register_dataset(key, dataset, load, perplexities):
+    SOURCES[key] = dataset
+    LOADERS[key] = load
+    PERPLEXITIES[key] = list(perplexities)
+
+
+def tabs(key):
+    return [
+        dcc.Tabs(
+            [
+            dcc.Tab(label="t-SNE test, perplexity: " + str(p), value=str(p))
+            for p in PERPLEXITIES[key]
+            ],
+            id={"type": TABS, "dataset": key},
+            value=str(PERPLEXITIES[key][0]),
+            ),
+        dcc.Graph(id={"type": GRAPH, "dataset": key}),
+        ]
+
+
+# One callback serves every dataset. The selected tab is drawn on demand;
+# zooming or panning resamples the points inside the new window on the server
+@callback(
+    Output({"type": GRAPH, "dataset": MATCH}, "figure"),
+    Input({"type": TABS, "dataset": MATCH}, "value"),
+    Input({"type": GRAPH, "dataset": MATCH}, "relayoutData"))
+def update_tsne(perplexity, relayout):
+    key = ctx.outputs_list["id"]["dataset"]
+    perplexity = int(perplexity)
+    if ctx.triggered_id and ctx.triggered_id["type"] == GRAPH:
+        if not relayout or not any(k.startswith(("xaxis", "yaxis")) for k in relayout):
+            raise PreventUpdate
+        x_range, y_range = view_range(relayout, "xaxis"), view_range(relayout, "yaxis")
+        if x_range or y_range:
+            return tsne_figure(LOADERS[key](), perplexity, x_range, y_range)
+    return cached_figure(key, perplexity)
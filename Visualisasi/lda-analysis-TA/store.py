@@ -0,0 +1,195 @@
+import collections
+import functools
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from pipeline import atomic_path, search, tokens, topics
+
+# Data files live next to the page modules
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+
+# Column types of the columnar copies
+CATEGORY_COLUMNS = ["app", "label"]
+DATETIME_COLUMNS = ["at", "datetime"]
+INT_COLUMNS = ["topic_id"]
+FLOAT_COLUMNS = re.compile(r"^([xy]?\d+|score|value)$")
+
+SENTIMENTS = ["negative", "neutral", "positive"]
+
+# One entry per dataset page: its path, data files, perplexities and LDAvis asset
+MANIFEST = "datasets.json"
+
+# Sentiment percentages as a dense app x topic x sentiment array
+Chart = collections.namedtuple("Chart", ["apps", "topics", "values"])
+
+
+def resolve(path):
+    # Relative paths are relative to the pages folder, not the working directory
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+
+def load_manifest():
+    with open(resolve(MANIFEST), "r") as f:
+        return json.load(f)
+
+
+def feather_path(csv_path):
+    return os.path.splitext(resolve(csv_path))[0] + ".feather"
+
+
+def convert(csv_path):
+    csv_path = resolve(csv_path)
+    df = pd.read_csv(csv_path, index_col=False)
+    df = df.loc[:, ~df.columns.str.startswith("Unnamed")]
+
+    # POS tags are kept as interned ids next to the Feather file, not as repr strings
+    if "postag" in df.columns:
+        tokens.save_tokens(tokens.from_postag(df.pop("postag")), tokens.tokens_path(csv_path))
+
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in DATETIME_COLUMNS:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif col in INT_COLUMNS:
+            df[col] = df[col].astype("int16")
+        elif FLOAT_COLUMNS.match(col):
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+
+    # Uncompressed Feather V2 can be memory mapped without decoding
+    # and is written under a temporary name, as other processes may map it
+    path = feather_path(csv_path)
+    with atomic_path(path) as tmp:
+        feather.write_feather(df, tmp, compression="uncompressed")
+    return path
+
+
+def read_columns(csv_path, columns=None):
+    path = feather_path(csv_path)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(resolve(csv_path)):
+        convert(csv_path)
+
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def data_version(path):
+    st = os.stat(resolve(path))
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def data_versions(paths):
+    # Versions of every file an object is built from, for the key of its cache
+    return tuple(data_version(p) for p in paths)
+
+
+def versioned(maxsize=32):
+    # Memoize on the first argument's path and the version of that file, so
+    # a changed file is read again instead of served from the cache
+    def decorate(func):
+        cached = functools.lru_cache(maxsize=maxsize)(lambda path, version, *args: func(path, *args))
+
+        @functools.wraps(func)
+        def wrapper(path, *args):
+            return cached(path, data_version(path), *args)
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorate
+
+
+# Memoized loaders shared by all pages. Nothing is read until a page asks
+# for it, and every later request reuses the same objects until the file
+# changes, so callers must not modify what they get back.
+
+@versioned()
+def load_reviews(csv_path, columns=None):
+    df = read_columns(csv_path, list(columns) if columns else None)
+    if "topic_id" in df.columns:
+        df["topic_id"] = df["topic_id"].astype(str)
+    return df
+
+
+@versioned()
+def load_tokens(csv_path):
+    # Converted with the Feather copy; rebuilt from the postag column alone
+    # when only the tokens folder is missing or older than the CSV
+    read_columns(csv_path, [])
+    path = tokens.tokens_path(resolve(csv_path))
+    offsets = os.path.join(path, "offsets.npy")
+    if not os.path.exists(offsets) or os.path.getmtime(offsets) < os.path.getmtime(resolve(csv_path)):
+        postag = pd.read_csv(resolve(csv_path), usecols=["postag"])["postag"]
+        tokens.save_tokens(tokens.from_postag(postag), path)
+    return tokens.load_tokens(path)
+
+
+@versioned()
+def load_search_index(csv_path):
+    # Keyword index of the text columns, rebuilt when the CSV changes or the
+    # index was built from other columns
+    path = search.index_path(resolve(csv_path))
+    postings = os.path.join(path, "postings.npy")
+    indexed = os.path.join(path, "columns.npy")
+    read_columns(csv_path, [])
+    columns = search.text_columns(feather.read_table(feather_path(csv_path), memory_map=True).column_names)
+    if (not os.path.exists(postings) or os.path.getmtime(postings) < os.path.getmtime(resolve(csv_path))
+            or not os.path.exists(indexed) or list(np.load(indexed)) != columns):
+        texts = search.join_columns(read_columns(csv_path, columns), columns)
+        search.save_index(search.build_index(texts, columns), path)
+    return search.load_index(path)
+
+
+@versioned()
+def load_topic_terms(json_path):
+    # K x V matrix exported by the LDA stage next to the topics JSON; built
+    # from the JSON's top terms when the export is missing or older
+    json_path = resolve(json_path)
+    path = topics.topic_terms_path(json_path)
+    weights = os.path.join(path, "weights.npy")
+    if not os.path.exists(weights) or os.path.getmtime(weights) < os.path.getmtime(json_path):
+        topics.save_topic_terms(topics.from_topics_json(json_path), path)
+    return topics.load_topic_terms(path)
+
+
+@versioned()
+def load_topics(json_path, n=10):
+    return topics.describe(load_topic_terms(json_path), n)
+
+
+@versioned()
+def load_coherence(csv_path, n=10):
+    coherence = pd.read_csv(resolve(csv_path))
+    coherence = coherence.sort_values(['Coherence'], ascending=[False])
+    return coherence.head(n)
+
+
+@versioned()
+def load_chart(csv_path):
+    chart = pd.read_csv(resolve(csv_path))
+    apps = pd.Categorical(chart["aplikasi"], categories=pd.unique(chart["aplikasi"]))
+    topics = pd.Categorical(chart["topic"], categories=pd.unique(chart["topic"]))
+    sentiments = pd.Categorical(chart["sentiment"], categories=SENTIMENTS)
+
+    values = np.zeros((len(apps.categories), len(topics.categories), len(SENTIMENTS)))
+    values[apps.codes, topics.codes, sentiments.codes] = chart["value"].to_numpy()
+    values.setflags(write=False)
+    return Chart(list(apps.categories), list(topics.categories), values)
+
+
+def chart_data(chart):
+    # JSON form of a Chart for the clientside radar callbacks
+    return {"apps": chart.apps, "topics": chart.topics, "sentiments": SENTIMENTS, "values": chart.values.tolist()}
+
+
+if __name__ == "__main__":
+    for folder in ["dataset", "output"]:
+        for name in sorted(os.listdir(resolve(folder))):
+            if name.endswith(".json"):
+                load_topic_terms(os.path.join(folder, name))
+                print(topics.topic_terms_path(resolve(os.path.join(folder, name))))
+            elif name.endswith("-dataset.csv") or name in ["dating-dashboard.csv", "lda_df.csv"]:
+                print(convert(os.path.join(folder, name)))
@@ -0,0 +1,147 @@
+import pandas as pd
+import plotly.graph_objs as go
+from dash import callback, ctx, dcc, html, Input, Output, MATCH
+
+import aggregates
+import figcache
+import payload
+import store
+
+# Rollup periods, as pandas period frequencies; week and month are summed from day
+PERIODS = {"day": "D", "week": "W", "month": "M"}
+MEASURES = {"count": "Reviews", "share": "Share of reviews (%)"}
+ALL = "all"
+
+# Component types of the pattern-matching IDs {"type": ..., "dataset": key}
+APP = "timeline-app"
+TOPIC = "timeline-topic"
+PERIOD = "timeline-period"
+MEASURE = "timeline-measure"
+DATES = "timeline-dates"
+GRAPH = "timeline-graph"
+
+# Review CSV of each registered dataset
+DATASETS = {}
+
+
+@store.versioned()
+def load_daily(csv_path):
+    return aggregates.count_by_day(store.read_columns(csv_path, ["at"] + aggregates.KEYS))
+
+
+@store.versioned()
+def load_rollup(csv_path, period):
+    daily = load_daily(csv_path)
+    if period == "day":
+        return daily
+    start = daily.index.get_level_values("at").to_period(PERIODS[period]).start_time.rename("at")
+    levels = [daily.index.get_level_values(k) for k in aggregates.KEYS]
+    return daily.groupby([start] + levels, observed=True).sum()
+
+
+def periods(csv_path, period):
+    # Start of every period the dataset spans, including those without reviews
+    days = load_daily(csv_path).index.get_level_values("at")
+    return pd.period_range(days.min(), days.max(), freq=PERIODS[period]).start_time.rename("at")
+
+
+def series(csv_path, period, app=ALL, topic=ALL, start=None, end=None):
+    # Reviews per period and sentiment for one app/topic, or all of them, from
+    # start to end (ISO dates, both optional); periods without reviews are 0
+    counts = load_rollup(csv_path, period)
+    if app != ALL:
+        counts = counts[counts.index.get_level_values("app") == app]
+    if topic != ALL:
+        counts = counts[counts.index.get_level_values("topic_id") == int(topic)]
+    table = counts.groupby(["at", "label"], observed=True).sum().unstack("label", fill_value=0)
+    table = table.reindex(index=periods(csv_path, period), columns=store.SENTIMENTS, fill_value=0)
+    # Periods overlapping the window, so a week or month is not cut off
+    first = pd.Period(start, PERIODS[period]).start_time if start else None
+    return table.loc[first:end]
+
+
+@figcache.cached("timeline", lambda key, *args: [store.data_version(DATASETS[key])])
+def timeline_figure(key, period, measure, app=ALL, topic=ALL, start=None, end=None):
+    table = series(DATASETS[key], period, app, topic, start, end)
+    fig = go.Figure()
+    for sentiment in store.SENTIMENTS:
+        fig.add_trace(go.Scatter(
+            x=table.index,
+            y=table[sentiment],
+            name=sentiment,
+            mode="lines",
+            stackgroup="one",
+            groupnorm="percent" if measure == "share" else None,
+        ))
+    fig.update_layout(yaxis_title=MEASURES[measure], hovermode="x unified")
+    return payload.compact_figure(fig)
+
+
+def register_dataset(key, dataset):
+    DATASETS[key] = dataset
+
+
+def card(key, topics):
+    # Apps as named in the review file, which may differ from the chart CSVs
+    daily = load_daily(DATASETS[key])
+    apps = sorted(daily.index.get_level_values("app").unique())
+    days = daily.index.get_level_values("at")
+    return html.Div([
+        html.Div([
+            dcc.Dropdown(
+                id={"type": APP, "dataset": key},
+                options=[{"label": "All apps", "value": ALL}] + [{"label": app, "value": app} for app in apps],
+                value=ALL,
+                clearable=False,
+                className="w-25 me-2",
+                ),
+            dcc.Dropdown(
+                id={"type": TOPIC, "dataset": key},
+                options=[{"label": "All topics", "value": ALL}] + [
+                    {"label": f"{i}: {topic}", "value": str(i)} for i, topic in enumerate(topics)
+                    ],
+                value=ALL,
+                clearable=False,
+                className="w-50 me-2",
+                ),
+            dcc.RadioItems(
+                id={"type": PERIOD, "dataset": key},
+                options=[{"label": p, "value": p} for p in PERIODS],
+                value="week",
+                inline=True,
+                inputClassName="me-1",
+                labelClassName="me-3",
+                ),
+            dcc.RadioItems(
+                id={"type": MEASURE, "dataset": key},
+                options=[{"label": m, "value": m} for m in MEASURES],
+                value="count",
+                inline=True,
+                inputClassName="me-1",
+                labelClassName="me-3",
+                ),
+            dcc.DatePickerRange(
+                id={"type": DATES, "dataset": key},
+                min_date_allowed=days.min().date(),
+                max_date_allowed=days.max().date(),
+                start_date_placeholder_text="From",
+                end_date_placeholder_text="To",
+                clearable=True,
+                ),
+            ], className="d-flex flex-row align-items-center flex-wrap"),
+        dcc.Graph(id={"type": GRAPH, "dataset": key}),
+        ])
+
+
+# One callback serves every dataset; each period is summed once per data version
+# and a date range is a slice of that rollup
+@callback(
+    Output({"type": GRAPH, "dataset": MATCH}, "figure"),
+    Input({"type": APP, "dataset": MATCH}, "value"),
+    Input({"type": TOPIC, "dataset": MATCH}, "value"),
+    Input({"type": PERIOD, "dataset": MATCH}, "value"),
+    Input({"type": MEASURE, "dataset": MATCH}, "value"),
+    Input({"type": DATES, "dataset": MATCH}, "start_date"),
+    Input({"type": DATES, "dataset": MATCH}, "end_date"))
+def update_timeline(app, topic, period, measure, start, end):
+    return timeline_figure(ctx.outputs_list["id"]["dataset"], period, measure, app, topic, start, end)
@@ -0,0 +1,45 @@
+"""Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+create_app() builds the compressed pyLDAvis files if they are missing or
+stale, imports the Dash app and loads every dataset, page layout and t-SNE
+figure once. With --preload gunicorn does this in the master process
+and then forks, so the workers share the loaded data copy-on-write instead
+of each reading it again. app.py's app.run(debug=True) stays for
+development only.
+"""
+import gc
+
+import dash
+
+
+def preload():
+    import explorer
+    import ldavis
+    import scatter
+
+    if not ldavis.built():
+        ldavis.build()
+
+    for page in dash.page_registry.values():
+        try:
+            if callable(page["layout"]):
+                page["layout"]()
+        except FileNotFoundError as e:
+            print("skipped", page["path"] + ":", e)
+    scatter.preload()
+    explorer.preload()
+
+
+def create_app():
+    from app import app
+
+    preload()
+    # Keep the loaded objects out of later collections, which would
+    # otherwise write to their pages and undo the sharing after the fork
+    gc.freeze()
+    return app.server
+
+
+server = create_app()